@@ -1,13 +1,45 @@
 """x86 assembly module"""
 
+from typing import Any
 from typing import Self
 from typing import List
+from typing import Tuple
+from typing import Union
+from dataclasses import dataclass
 
 from .label import Label
+from .coalesce import Coalescer
+from .coalesce import COALESCE_MAX_LINE
+from .render import render
+from .render import RENDER_CHUNK_LINES
 from ..utils.store import BaseStore
 
 from ..exceptions.exception import OtError
 
+@dataclass
+class AsmReport:
+    """
+        Representing the size of the rendered assembly
+    """
+    
+    # text lines
+    lines: int
+    # emitted bytes
+    size: int
+
+@dataclass
+class AsmSymbol:
+    """
+        Representing a label placed in its section
+    """
+    
+    name: str
+    # None for the section of the including file
+    section: Union[str, None]
+    # from the start of the section, alignment padding included
+    offset: int
+    size: int
+
 class Assembly(BaseStore):
     """
         Managing asm dumping
@@ -17,7 +49,17 @@ class Assembly(BaseStore):
         super().__init__()
         
         self.__labels = []
+        self.__coalescer = None
         
+    def clear_store(self):
+        """
+            Reset the storage and the known labels
+        """
+        
+        super().clear_store()
+        
+        self.__labels.clear()
+    
     def label_exists(self, obj: Label) -> bool:
         """
             Returns if a label already exists
@@ -37,12 +79,150 @@ class Assembly(BaseStore):
 
         return self.add(obj)
     
+    def set_section(self, name: Union[str, None]) -> Self:
+        """
+            Place the whole assembly in the section `name`
+        """
+        
+        labels = [obj for obj in self.get_store() if isinstance(obj, Label)]
+        
+        if not labels:
+            raise OtError("No label to place")
+        
+        labels[0].set_section(name)
+        
+        return self
+    
+    def get_align(self) -> int:
+        """
+            Returns the biggest label alignment
+        """
+        
+        return max(
+            (obj.align for obj in self.get_store() if isinstance(obj, Label)),
+            default=1
+        )
+    
+    def __place(
+        self,
+        objs: List[Any],
+        offsets: dict,
+        section: List[Union[str, None]],
+        symbols: List[AsmSymbol]
+    ):
+        """
+            Place `objs` like the assembler would, `section` holds
+            the current section and `offsets` the offset of each section
+        """
+        
+        for obj in objs:
+            if not isinstance(obj, Label):
+                offsets[section[0]] = offsets.get(section[0], 0) \
+                    + (obj.get_size() if hasattr(obj, "get_size") else 0)
+                
+                continue
+            
+            if obj.section:
+                section[0] = obj.section
+            
+            offset = offsets.get(section[0], 0)
+            offset = -(-offset // obj.align) * obj.align
+            offsets[section[0]] = offset
+            
+            symbols.append(
+                AsmSymbol(obj.name, section[0], offset, obj.get_size())
+            )
+            
+            self.__place(obj.get_store(), offsets, section, symbols)
+    
+    def get_symbols(self) -> List[AsmSymbol]:
+        """
+            Returns the symbol table, the alignment padding is
+            accounted in the offsets
+        """
+        
+        symbols = []
+        
+        self.__place(self.get_store(), {}, [None], symbols)
+        
+        return symbols
+    
+    def get_size(self) -> int:
+        """
+            Returns the amount of bytes emitted in every section,
+            alignment padding included
+        """
+        
+        offsets = {}
+        
+        self.__place(self.get_store(), offsets, [None], [])
+        
+        return sum(offsets.values())
+    
+    def to_bytes(self, skip: Tuple[str] = ()) -> bytes:
+        """
+            Returns the binary form, labels are padded with zeros
+            to their alignment and the ones named in `skip` are left out.
+            
+            Sections are ignored, everything is packed in one blob.
+        """
+        
+        ret = bytearray()
+        
+        for obj in self.get_store():
+            if isinstance(obj, Label):
+                if obj.name in skip:
+                    continue
+                
+                ret += bytes(-len(ret) % obj.align)
+            
+            if hasattr(obj, "to_bytes"):
+                ret += obj.to_bytes()
+        
+        return bytes(ret)
+    
+    def set_coalescing(
+        self,
+        max_values: Union[int, None],
+        max_line: int = COALESCE_MAX_LINE
+    ) -> Self:
+        """
+            Pack up to `max_values` values of the same type and format
+            per directive line, None disables it
+        """
+        
+        if max_values == None:
+            self.__coalescer = None
+        else:
+            self.__coalescer = Coalescer(max_values, max_line)
+        
+        return self
+    
+    def __get_objs(self) -> List[object]:
+        """
+            Returns the objs to render, coalesced if enabled
+        """
+        
+        if self.__coalescer == None:
+            return self.get_store()
+        
+        return self.__coalescer.coalesce(self.get_store())
+    
     def __get_asm(self) -> List[str]:
         """
             Returns the formatted asm
         """
         
-        return list(map(str, self.get_store()))
+        return list(map(str, self.__get_objs()))
+    
+    def get_report(self) -> AsmReport:
+        """
+            Returns the line count and byte size of the output
+        """
+        
+        data = "\n".join(self.__get_asm())
+        
+        return AsmReport(data.count("\n") + 1, self.get_size())
     
     def dump_asm(self):
         """
@@ -51,12 +231,28 @@ class Assembly(BaseStore):
         
         print("\n".join(self.__get_asm()))
     
-    def save_asm(self, path: str):
+    def save_asm(
+        self,
+        path: str,
+        workers: Union[int, None] = None,
+        chunk_lines: int = RENDER_CHUNK_LINES
+    ):
         """
-            Dump the asm into `path`
+            Dump the asm into `path`, streaming it piece by piece
+            
+            With `workers`, the rendering is split into label aligned
+            chunks of about `chunk_lines` lines, rendered by a process pool.
         """
         
+        # Checked before `path` is truncated
+        if chunk_lines < 1:
+            raise OtError("At least one line per chunk")
+
+        pieces = render(self.__get_objs(), workers, chunk_lines)
+        
         with open(path, "w") as f:
-            data = "\n".join(self.__get_asm())
+            for i, piece in enumerate(pieces):
+                if i:
+                    f.write("\n")
 
-            f.write(data)
+                f.write(piece)
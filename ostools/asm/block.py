@@ -0,0 +1,191 @@
+"""columnar data block module"""
+
+import sys
+
+from array import array
+from typing import Self
+from typing import Union
+from typing import Iterable
+from typing import Iterator
+
+from .types import TypeValue
+from .types import TypeFormat
+
+from ..exceptions.exception import OtError
+
+# element width (bytes) -> assembly directive
+BLOCK_DIRECTIVES = {
+    1: "db",
+    2: "dw",
+    4: "dd"
+}
+
+def _typecode(width: int) -> str:
+    """
+        Returns the `array` typecode matching `width` bytes
+    """
+
+    for typecode in "BHIL":
+        if array(typecode).itemsize == width:
+            return typecode
+
+    raise OtError("No array typecode for this width")
+
+class DataBlock:
+    """
+        Columnar store of integer values sharing a single
+        element width and `TypeFormat`.
+
+        The values live in an `array` buffer, the assembly text
+        is only rendered when the block is written.
+    """
+
+    def __init__(
+        self,
+        width: int = 1,
+        __format: TypeFormat = TypeFormat.DEFAULT,
+        per_line: int = 1,
+        data: Union[bytes, Iterable[int]] = b""
+    ):
+        if not width in BLOCK_DIRECTIVES:
+            raise OtError("Invalid element width")
+
+        if per_line < 1:
+            raise OtError("At least one value per line")
+
+        self.width = width
+        self.per_line = per_line
+        self.__format = __format
+        self.__values = array(_typecode(width))
+
+        self.extend(data)
+
+    def __len__(self) -> int:
+        return len(self.__values)
+
+    def __reduce__(self):
+        return (
+            DataBlock,
+            (self.width, self.__format, self.per_line, self.to_bytes())
+        )
+
+    def __check(self, value: int):
+        """
+            Raise if `value` does not fit `self.width` bytes
+        """
+
+        if not 0 <= value < 1 << (self.width * 8):
+            raise OtError(f"Value {value} does not fit the element width")
+
+    def get_format(self) -> TypeFormat:
+        """
+            Getter for `self.__format`
+        """
+
+        return self.__format
+
+    def get_directive(self) -> str:
+        """
+            Returns the directive used for every line (db, dw, dd)
+        """
+
+        return BLOCK_DIRECTIVES[self.width]
+
+    def get_values(self) -> array:
+        """
+            Getter for the raw values buffer
+        """
+
+        return self.__values
+
+    def get_size(self) -> int:
+        """
+            Returns the amount of bytes emitted by the block
+        """
+
+        return len(self.__values) * self.width
+
+    def slice(self, start: int, end: int) -> Self:
+        """
+            Returns a new block holding the values in [start, end)
+        """
+
+        return DataBlock(
+            self.width,
+            self.__format,
+            self.per_line,
+            self.__values[start:end]
+        )
+
+    def append(self, value: int) -> Self:
+        """
+            Add a single value
+        """
+
+        self.__check(value)
+        self.__values.append(value)
+
+        return self
+
+    def extend(self, data: Union[bytes, Iterable[int]]) -> Self:
+        """
+            Add values, `bytes` are read as little endian
+            elements of `self.width` bytes
+        """
+
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            if len(data) % self.width:
+                raise OtError("Buffer length isnt a multiple of the width")
+
+            values = array(self.__values.typecode)
+            values.frombytes(bytes(data))
+
+            if sys.byteorder == "big":
+                values.byteswap()
+
+            self.__values.extend(values)
+        elif isinstance(data, array) and data.typecode == self.__values.typecode:
+            # Already in range
+            self.__values.extend(data)
+        else:
+            values = list(data)
+
+            if values:
+                self.__check(min(values))
+                self.__check(max(values))
+
+            self.__values.extend(values)
+
+        return self
+
+    def to_bytes(self) -> bytes:
+        """
+            Returns the values as little endian bytes
+        """
+
+        if sys.byteorder == "big":
+            values = array(self.__values.typecode, self.__values)
+            values.byteswap()
+
+            return values.tobytes()
+
+        return self.__values.tobytes()
+
+    def lines(self, per_line: Union[int, None] = None) -> Iterator[str]:
+        """
+            Yields the formatted assembly lines,
+            `per_line` overrides `self.per_line`
+        """
+
+        per_line = per_line or self.per_line
+        directive = self.get_directive() + " "
+        bits = self.width * 8
+        fmt = lambda x: TypeValue.format_int(x, self.__format, bits)
+
+        for i in range(0, len(self.__values), per_line):
+            chunk = self.__values[i:i + per_line]
+
+            yield directive + ",".join(map(fmt, chunk))
+
+    def __str__(self) -> str:
+        return "\n".join(self.lines())
@@ -0,0 +1,136 @@
+"""directive coalescing module"""
+
+from typing import Any
+from typing import List
+
+from .block import DataBlock
+from .label import LABEL_INDENT
+from .types import BaseType
+from .types import TypeValue
+from ..utils.store import BaseStore
+
+from ..exceptions.exception import OtError
+
+# Conservative line length, far below what NASM accepts
+COALESCE_MAX_LINE = 1024
+
+class Coalescer:
+    """
+        Packs consecutive directives sharing the same type and format
+        into lines of up to `max_values` values
+    """
+
+    def __init__(self, max_values: int, max_line: int = COALESCE_MAX_LINE):
+        if max_values < 1:
+            raise OtError("At least one value per line")
+
+        self.max_values = max_values
+        self.max_line = max_line
+
+        self.__type = None
+        self.__format = None
+        self.__values = []
+
+    def __flush(self, ret: List[Any]):
+        """
+            Emits the pending values into `ret`
+        """
+
+        chunk = []
+        # Room for the label indentation
+        start = len(LABEL_INDENT) + len(self.__type)
+        length = start
+
+        for value in self.__values:
+            value_length = len(str(value)) + 1
+
+            if chunk and (
+                len(chunk) == self.max_values
+                or length + value_length > self.max_line
+            ):
+                ret.append(BaseType(self.__type, *chunk))
+                chunk = []
+                length = start
+
+            chunk.append(value)
+            length += value_length
+
+        if chunk:
+            ret.append(BaseType(self.__type, *chunk))
+
+        self.__type = None
+        self.__format = None
+        self.__values = []
+
+    def __push(self, obj: BaseType, ret: List[Any]):
+        """
+            Queue the values of `obj`
+        """
+
+        __format = obj.get_format()
+
+        if (
+            __format == None
+            or obj.type != self.__type
+            or __format != self.__format
+        ):
+            if self.__values:
+                self.__flush(ret)
+
+            if __format == None:
+                ret.append(obj)
+
+                return
+
+        self.__type = obj.type
+        self.__format = __format
+        self.__values.extend(obj.args)
+
+    def __coalesce_block(self, block: DataBlock) -> DataBlock:
+        """
+            Returns a copy of `block` with as many values per line
+            as the limits allow
+        """
+
+        if len(block) == 0:
+            return block
+
+        values = block.get_values()
+        __format = block.get_format()
+
+        # Values are unsigned, the biggest one renders the longest
+        widest = TypeValue.format_int(max(values), __format, block.width * 8)
+        start = len(LABEL_INDENT) + len(block.get_directive())
+
+        per_line = (self.max_line - start) // (len(widest) + 1)
+        per_line = max(1, min(self.max_values, per_line))
+
+        return DataBlock(block.width, __format, per_line, values)
+
+    def coalesce(self, objs: List[Any]) -> List[Any]:
+        """
+            Returns a new list of objs, `objs` is left untouched
+        """
+
+        ret = []
+
+        for obj in objs:
+            if isinstance(obj, BaseType):
+                self.__push(obj, ret)
+
+                continue
+
+            if self.__values:
+                self.__flush(ret)
+
+            if isinstance(obj, DataBlock):
+                ret.append(self.__coalesce_block(obj))
+            elif isinstance(obj, BaseStore):
+                ret.append(obj.copy(self.coalesce(obj.get_store())))
+            else:
+                ret.append(obj)
+
+        if self.__values:
+            self.__flush(ret)
+
+        return ret
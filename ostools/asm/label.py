@@ -1,7 +1,20 @@
 """label module"""
 
+from typing import Self
+from typing import Union
+
 from ..utils.store import BaseStore
 
+from ..exceptions.exception import OtError
+
+# Common alignments (bytes)
+ALIGN_DESCRIPTOR = 8
+ALIGN_CACHE_LINE = 64
+ALIGN_PAGE = 4096
+
+# Indentation of the label content
+LABEL_INDENT = "    "
+
 class Label(BaseStore):
     """
         Represents an assembly label
@@ -11,11 +24,46 @@ class Label(BaseStore):
         super().__init__()
 
         self.name = name
+        self.align = 1
+        self.section = None
+
+    def set_align(self, value: int) -> Self:
+        """
+            Align the label on `value` bytes (power of two),
+            the padding is filled with zeros
+        """
+
+        if value < 1 or value & (value - 1):
+            raise OtError("Alignment has to be a power of two")
+
+        self.align = value
+
+        return self
+
+    def set_section(self, name: Union[str, None]) -> Self:
+        """
+            Place the label (and what follows) in the section `name`
+        """
+
+        self.section = name
+
+        return self
 
     def __str__(self) -> str:
-        ret = [self.name + ":"]
+        ret = []
+
+        if self.section:
+            ret.append(f"section {self.section}")
+
+        if self.align > 1:
+            ret.append(f"align {self.align}, db 0")
+
+        ret.append(self.name + ":")
 
         for obj in self.get_store():
-            ret.append("    " + str(obj))
+            # Multi-lines objects (e.g `DataBlock`) get every line indented
+            ret.append(
+                LABEL_INDENT + str(obj).replace("\n", "\n" + LABEL_INDENT)
+            )
 
         return "\n".join(ret) + "\n"
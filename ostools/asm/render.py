@@ -0,0 +1,104 @@
+"""chunked rendering module"""
+
+from typing import Any
+from typing import List
+from typing import Union
+from typing import Iterator
+from concurrent.futures import ProcessPoolExecutor
+
+from .block import DataBlock
+from ..utils.store import BaseStore
+
+from ..exceptions.exception import OtError
+
+# Approximate amount of lines rendered by a single worker task
+RENDER_CHUNK_LINES = 8192
+
+def render_chunk(objs: List[Any]) -> str:
+    """
+        Render a chunk of objs, exactly like the serial output
+    """
+
+    return "\n".join(map(str, objs))
+
+def count_lines(obj: Any) -> int:
+    """
+        Returns the approximate amount of lines rendered by `obj`
+    """
+
+    if isinstance(obj, DataBlock):
+        return -(-len(obj) // obj.per_line)
+
+    if isinstance(obj, BaseStore):
+        return 1 + sum(map(count_lines, obj.get_store()))
+
+    return 1
+
+def split_chunks(
+    objs: List[Any],
+    chunk_lines: int = RENDER_CHUNK_LINES
+) -> Iterator[List[Any]]:
+    """
+        Split `objs` into label aligned chunks of about `chunk_lines`
+        lines. Top level `DataBlock` are cut on line boundaries.
+    """
+
+    if chunk_lines < 1:
+        raise OtError("At least one line per chunk")
+
+    chunk = []
+    lines = 0
+
+    for obj in objs:
+        if isinstance(obj, DataBlock) and len(obj):
+            # Keep every cut on a line boundary
+            step = chunk_lines * obj.per_line
+
+            for i in range(0, len(obj), step):
+                if lines >= chunk_lines:
+                    yield chunk
+
+                    chunk = []
+                    lines = 0
+
+                part = obj.slice(i, i + step)
+
+                chunk.append(part)
+                lines += count_lines(part)
+
+            continue
+
+        if isinstance(obj, BaseStore) and lines >= chunk_lines:
+            yield chunk
+
+            chunk = []
+            lines = 0
+
+        chunk.append(obj)
+        lines += count_lines(obj)
+
+    if chunk:
+        yield chunk
+
+def render(
+    objs: List[Any],
+    workers: Union[int, None] = None,
+    chunk_lines: int = RENDER_CHUNK_LINES
+) -> Iterator[str]:
+    """
+        Yields the rendered text of `objs` piece by piece, in order,
+        the pieces have to be joined with newlines.
+
+        With `workers`, label aligned chunks are rendered concurrently
+        in a process pool, the output is the same.
+    """
+
+    if not workers or workers < 2:
+        yield from map(str, objs)
+
+        return
+
+    chunks = split_chunks(objs, chunk_lines)
+
+    with ProcessPoolExecutor(workers) as executor:
+        yield from executor.map(render_chunk, chunks)
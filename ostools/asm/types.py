@@ -30,21 +30,39 @@ class TypeValue:
             If `self.value` has type int
         """
         
-        match self.__format:
+        return TypeValue.format_int(self.value, self.__format)
+    
+    def get_format(self) -> TypeFormat:
+        """
+            Getter for `self.__format`
+        """
+        
+        return self.__format
+    
+    @staticmethod
+    def format_int(value: int, __format: TypeFormat, bits: int = 8) -> str:
+        """
+            Format an int `value` with `__format`,
+            shared with the columnar stores.
+            
+            `BIN_FILL` pads the value to `bits` digits.
+        """
+        
+        match __format:
             case TypeFormat.DEFAULT:
-                return str(self.value)
+                return str(value)
             case TypeFormat.HEX:
-                return hex(self.value)
+                return hex(value)
             case TypeFormat.BIN:
-                return bin(self.value)[2:] + "b"
+                return bin(value)[2:] + "b"
             case TypeFormat.BIN_FILL:
-                binary = bin(self.value)[2:]
-                fill = "0" * (8 - len(binary))
+                binary = bin(value)[2:]
+                fill = "0" * (bits - len(binary))
                 
                 return fill + binary + "b"
             case TypeFormat.CHAR:
-                if self.value <= 0xff:
-                    return chr(self.value)
+                if value <= 0xff:
+                    return chr(value)
                 else:
                     raise OtError("Overflow")
             case _:
@@ -56,6 +74,13 @@ class TypeValue:
 
         return self.__int_to_str()
 
+# assembly type -> size in bytes of a single value
+TYPE_WIDTHS = {
+    "db": 1,
+    "dw": 2,
+    "dd": 4
+}
+
 class BaseType:
     """
         Representing an assembly type (db, dw, etc..)
@@ -65,6 +90,48 @@ class BaseType:
         self.args = args
         self.type = _type
     
+    def get_format(self) -> Union[TypeFormat, None]:
+        """
+            Returns the format shared by every value,
+            None if they differ
+        """
+        
+        formats = set(value.get_format() for value in self.args)
+        
+        if len(formats) != 1:
+            return None
+        
+        return formats.pop()
+    
+    def get_size(self) -> int:
+        """
+            Returns the amount of bytes emitted
+        """
+        
+        if not self.type in TYPE_WIDTHS:
+            raise OtError("Unknown type size")
+        
+        return TYPE_WIDTHS[self.type] * len(self.args)
+    
+    def to_bytes(self) -> bytes:
+        """
+            Returns the little endian binary form
+        """
+        
+        width = self.get_size() // max(1, len(self.args))
+        ret = bytearray()
+        
+        for value in self.args:
+            if type(value.value) != int:
+                raise OtError("Symbolic value, no binary form")
+            
+            ret += (value.value & ((1 << width * 8) - 1)).to_bytes(
+                width,
+                "little"
+            )
+        
+        return bytes(ret)
+    
     def __str__(self) -> str:
         values = ",".join(str(value) for value in self.args)
 
@@ -0,0 +1,470 @@
+"""generated artifacts build module
+
+Builds every artifact of a JSON manifest as a dependency graph,
+in a single interpreter:
+
+    {
+        "artifacts": [
+            {
+                "name": "font",
+                "kind": "psf",
+                "inputs": ["ter-v16n.psf.gz"],
+                "output": "build/font.asm",
+                "options": {"row_width": 2, "unicode": "HASH"}
+            },
+            {
+                "name": "gdt",
+                "kind": "gdt",
+                "output": "build/gdt.asm",
+                "options": {"entries": [{"name": "gdt_code", "access": 154}]}
+            },
+            {
+                "name": "isr",
+                "kind": "script",
+                "inputs": ["scripts/isr_macros.py"],
+                "output": "build/isr.asm"
+            }
+        ]
+    }
+
+An artifact also depends on the artifacts listed in "deps" and on the ones
+producing its inputs. Paths are relative to the manifest.
+
+    python -m ostools.build manifest.json -j 8
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import runpy
+import asyncio
+import hashlib
+import argparse
+import functools
+import threading
+import contextlib
+
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Union
+from concurrent.futures import Executor
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor
+
+from .gdt import Gdt
+from .gdt import GdtEntry
+from .gdt import GdtAccessByte
+from .psf import Psf
+from .psf import GlyphBitOrder
+from .unicode import UnicodeLayout
+
+from .exceptions.exception import OtError
+
+BUILD_STATE = ".ostools-build.json"
+BUILD_TIMINGS = "build-timings.json"
+
+# `sys.stdout` is global, scripts are run one at a time per process
+_STDOUT_LOCK = threading.Lock()
+
+def _build_psf(artifact: Dict[str, Any]):
+    """
+        Font -> assembly
+    """
+
+    options = artifact.get("options", {})
+    font = Psf(artifact["inputs"][0]).parse(
+        options.get("row_width", 1),
+        GlyphBitOrder[options.get("bit_order", "MSB")]
+    )
+
+    if "unicode" in options:
+        font.add_unicode_table(UnicodeLayout[options["unicode"]])
+
+    if "coalescing" in options:
+        font.set_coalescing(options["coalescing"])
+
+    font.save_asm(artifact["output"])
+
+def _build_gdt(artifact: Dict[str, Any]):
+    """
+        Entries description -> assembly
+    """
+
+    gdt = Gdt()
+
+    for entry in artifact.get("options", {}).get("entries", []):
+        gdt.add_entry(
+            GdtEntry(entry.get("name"))
+            .set_access_byte(GdtAccessByte(entry.get("access", 0)))
+            .set_flags(entry.get("flags", 0xcf))
+            .set_limit(entry.get("limit", 0xfffff))
+            .set_base(entry.get("base", 0))
+        )
+
+    gdt.add_end().add_descriptor().save_asm(artifact["output"])
+
+def _build_script(artifact: Dict[str, Any]):
+    """
+        Metaprogramming script (eg. `scripts/`) -> its standard output
+    """
+
+    output = io.StringIO()
+
+    with _STDOUT_LOCK, contextlib.redirect_stdout(output):
+        runpy.run_path(artifact["inputs"][0], run_name="__main__")
+
+    with open(artifact["output"], "w") as f:
+        f.write(output.getvalue())
+
+BUILDERS = {
+    "psf": _build_psf,
+    "gdt": _build_gdt,
+    "script": _build_script
+}
+
+@functools.cache
+def get_generator_digest() -> str:
+    """
+        Returns the digest of the `ostools` sources,
+        the artifacts are rebuilt when the generators change
+    """
+
+    package = os.path.dirname(os.path.abspath(__file__))
+    h = hashlib.sha256()
+
+    for root, dirs, files in os.walk(package):
+        dirs[:] = sorted(d for d in dirs if d != "__pycache__")
+
+        for name in sorted(files):
+            if not name.endswith(".py"):
+                continue
+
+            path = os.path.join(root, name)
+
+            h.update(os.path.relpath(path, package).encode())
+
+            with open(path, "rb") as f:
+                h.update(f.read())
+
+    return h.hexdigest()
+
+def run_artifact(artifact: Dict[str, Any]) -> float:
+    """
+        Build a single artifact, returns the elapsed seconds
+    """
+
+    start = time.perf_counter()
+
+    os.makedirs(os.path.dirname(artifact["output"]) or ".", exist_ok=True)
+    BUILDERS[artifact["kind"]](artifact)
+
+    return time.perf_counter() - start
+
+class BuildGraph:
+    """
+        Dependency graph of the artifacts of a manifest
+    """
+
+    def __init__(self, manifest: str):
+        self.root = os.path.dirname(os.path.abspath(manifest))
+
+        try:
+            with open(manifest, "r") as f:
+                artifacts = json.load(f)["artifacts"]
+        except OSError as e:
+            raise OtError(f"Cannot read {manifest} ({e.strerror})") from e
+        except (ValueError, KeyError, TypeError) as e:
+            raise OtError(f"Invalid manifest {manifest}") from e
+
+        if not isinstance(artifacts, list):
+            raise OtError(f"Invalid manifest {manifest}")
+
+        self.artifacts = {}
+        outputs = {}
+
+        for artifact in artifacts:
+            if not isinstance(artifact, dict):
+                raise OtError("An artifact has to be an object")
+
+            for key in ("name", "kind", "output"):
+                if not key in artifact:
+                    raise OtError(f"Artifact without \"{key}\"")
+
+            artifact = dict(artifact)
+            name = artifact["name"]
+
+            if name in self.artifacts:
+                raise OtError(f"Duplicate artifact {name}")
+
+            if not artifact["kind"] in BUILDERS:
+                raise OtError(f"Unknown kind for {name}")
+
+            artifact["inputs"] = [
+                self.__path(path) for path in artifact.get("inputs", [])
+            ]
+            artifact["output"] = self.__path(artifact["output"])
+
+            # Concurrent builds would race on the same file
+            if artifact["output"] in outputs:
+                raise OtError(
+                    f"{name} and {outputs[artifact['output']]} "
+                    "have the same output"
+                )
+
+            outputs[artifact["output"]] = name
+            self.artifacts[name] = artifact
+
+        self.deps = self.__get_deps()
+        self.order = self.__sort()
+
+    def __path(self, path: str) -> str:
+        """
+            Returns `path` relative to the manifest
+        """
+
+        return os.path.join(self.root, path)
+
+    def __get_deps(self) -> Dict[str, List[str]]:
+        """
+            Returns the dependencies of every artifact
+        """
+
+        producers = {
+            artifact["output"]: name
+            for name, artifact in self.artifacts.items()
+        }
+        ret = {}
+
+        for name, artifact in self.artifacts.items():
+            deps = list(artifact.get("deps", []))
+            deps += [
+                producers[path] for path in artifact["inputs"]
+                if path in producers
+            ]
+
+            for dep in deps:
+                if not dep in self.artifacts:
+                    raise OtError(f"{name} depends on unknown {dep}")
+
+            ret[name] = sorted(set(deps))
+
+        return ret
+
+    def __sort(self) -> List[str]:
+        """
+            Returns the artifacts in a topological order
+        """
+
+        ret = []
+        state = {}
+
+        def visit(name: str):
+            if state.get(name) == 1:
+                raise OtError(f"Dependency cycle on {name}")
+
+            if state.get(name) == 2:
+                return
+
+            state[name] = 1
+
+            for dep in self.deps[name]:
+                visit(dep)
+
+            state[name] = 2
+            ret.append(name)
+
+        for name in self.artifacts:
+            visit(name)
+
+        return ret
+
+    def get_digest(self, name: str, digests: Dict[str, str]) -> str:
+        """
+            Returns the digest of an artifact description, its inputs,
+            its dependencies digests and the generators sources
+        """
+
+        artifact = self.artifacts[name]
+        h = hashlib.sha256()
+
+        h.update(get_generator_digest().encode())
+        h.update(json.dumps(artifact, sort_keys=True).encode())
+
+        for path in artifact["inputs"]:
+            try:
+                with open(path, "rb") as f:
+                    for chunk in iter(lambda: f.read(1 << 20), b""):
+                        h.update(chunk)
+            except OSError as e:
+                raise OtError(
+                    f"{name}: cannot read {path} ({e.strerror})"
+                ) from e
+
+        for dep in self.deps[name]:
+            h.update(digests[dep].encode())
+
+        return h.hexdigest()
+
+class Builder:
+    """
+        Builds a `BuildGraph`, independent artifacts run concurrently
+        and unchanged ones are skipped
+    """
+
+    def __init__(
+        self,
+        graph: BuildGraph,
+        workers: Union[int, None] = None,
+        threads: bool = False,
+        force: bool = False
+    ):
+        self.graph = graph
+        self.workers = workers or os.cpu_count() or 1
+        self.threads = threads
+        self.force = force
+
+        self.__state_path = os.path.join(graph.root, BUILD_STATE)
+        self.timings = {}
+
+    def __load_state(self) -> Dict[str, str]:
+        """
+            Returns the digests of the previous build
+        """
+
+        try:
+            with open(self.__state_path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    async def __build(
+        self,
+        name: str,
+        executor: Executor,
+        tasks: Dict[str, asyncio.Task],
+        state: Dict[str, str],
+        digests: Dict[str, str]
+    ):
+        """
+            Build `name` once its dependencies are built
+        """
+
+        await asyncio.gather(*(tasks[dep] for dep in self.graph.deps[name]))
+
+        artifact = self.graph.artifacts[name]
+        digest = self.graph.get_digest(name, digests)
+        digests[name] = digest
+
+        if (
+            not self.force
+            and state.get(name) == digest
+            and os.path.exists(artifact["output"])
+        ):
+            self.timings[name] = {"status": "skipped", "seconds": 0}
+
+            return
+
+        loop = asyncio.get_running_loop()
+
+        try:
+            seconds = await loop.run_in_executor(executor, run_artifact, artifact)
+        except Exception as e:
+            raise OtError(f"{name}: {e}") from e
+
+        self.timings[name] = {"status": "built", "seconds": seconds}
+
+    async def __run(self) -> Dict[str, str]:
+        """
+            Schedule every artifact
+        """
+
+        pool = ThreadPoolExecutor if self.threads else ProcessPoolExecutor
+        state = self.__load_state()
+        digests = {}
+        tasks = {}
+
+        with pool(self.workers) as executor:
+            for name in self.graph.order:
+                tasks[name] = asyncio.ensure_future(
+                    self.__build(name, executor, tasks, state, digests)
+                )
+
+            try:
+                await asyncio.gather(*tasks.values())
+            finally:
+                # Keep what has been built for the next run
+                state.update({
+                    name: digests[name] for name in self.timings
+                    if name in digests
+                })
+
+                with open(self.__state_path, "w") as f:
+                    json.dump(state, f, indent=4)
+
+        return digests
+
+    def run(self) -> Dict[str, Dict[str, Any]]:
+        """
+            Build everything, returns the timings
+        """
+
+        start = time.perf_counter()
+
+        asyncio.run(self.__run())
+
+        self.timings["__total__"] = {
+            "status": "done",
+            "seconds": time.perf_counter() - start
+        }
+
+        return self.timings
+
+    def save_timings(self, path: str):
+        """
+            Dump the timings manifest into `path`
+        """
+
+        with open(path, "w") as f:
+            json.dump(self.timings, f, indent=4)
+
+def main(argv: Union[List[str], None] = None):
+    """
+        Command line entry point
+    """
+
+    parser = argparse.ArgumentParser(
+        prog="python -m ostools.build",
+        description="Build the generated kernel artifacts of a manifest"
+    )
+
+    parser.add_argument("manifest")
+    parser.add_argument("-j", "--jobs", type=int, default=None)
+    parser.add_argument("--threads", action="store_true",
+        help="use a thread pool instead of a process pool")
+    parser.add_argument("--force", action="store_true",
+        help="rebuild unchanged artifacts")
+    parser.add_argument("--timings", default=None,
+        help=f"timings manifest path (default: {BUILD_TIMINGS})")
+
+    args = parser.parse_args(argv)
+
+    try:
+        graph = BuildGraph(args.manifest)
+        builder = Builder(graph, args.jobs, args.threads, args.force)
+        timings = builder.run()
+    except OtError as e:
+        print(f"error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    builder.save_timings(
+        args.timings or os.path.join(graph.root, BUILD_TIMINGS)
+    )
+
+    for name, timing in timings.items():
+        print(f"{name}: {timing['status']} ({timing['seconds']:.3f}s)")
+
+if __name__ == "__main__":
+    main()
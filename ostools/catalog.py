@@ -0,0 +1,113 @@
+"""font catalog module"""
+
+import os
+
+from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import Union
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+
+from .psf import Psf1Header
+from .psf import probe_header
+
+from .exceptions.exception import OtError
+
+FONT_EXTENSIONS = (".psf", ".psfu", ".psf.gz", ".psfu.gz")
+
+@dataclass
+class FontInfo:
+    """
+        Representing the metadata of a font file
+    """
+
+    path: str
+    # PSF version, 1 or 2
+    version: int
+    width: int
+    height: int
+    # glyphs amount
+    length: int
+    unicode: bool
+
+def probe_font(path: str) -> FontInfo:
+    """
+        Returns the metadata of a font, only its header is read
+    """
+
+    header = probe_header(path)
+    w, h = header.get_dimensions()
+
+    return FontInfo(
+        path,
+        1 if isinstance(header, Psf1Header) else 2,
+        w,
+        h,
+        header.get_length(),
+        header.has_unicode_table()
+    )
+
+class FontCatalog:
+    """
+        Index of the fonts of a directory
+        (eg. /usr/share/consolefonts), built from their headers
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        extensions: Tuple[str] = FONT_EXTENSIONS,
+        workers: Union[int, None] = None
+    ):
+        paths = sorted(
+            entry.path for entry in os.scandir(directory)
+            if entry.is_file() and entry.name.endswith(extensions)
+        )
+
+        with ThreadPoolExecutor(workers) as executor:
+            fonts = executor.map(self.__probe, paths)
+
+        self.fonts = [font for font in fonts if font != None]
+
+    @staticmethod
+    def __probe(path: str) -> Union[FontInfo, None]:
+        """
+            Probe a font, None if it isnt a valid one
+        """
+
+        try:
+            return probe_font(path)
+        except (OtError, OSError):
+            return None
+
+    def by_dimensions(self) -> Dict[Tuple[int, int], List[FontInfo]]:
+        """
+            Returns the fonts indexed by (w, h)
+        """
+
+        ret = {}
+
+        for font in self.fonts:
+            ret.setdefault((font.width, font.height), []).append(font)
+
+        return ret
+
+    def find(
+        self,
+        width: Union[int, None] = None,
+        height: Union[int, None] = None,
+        min_length: int = 0,
+        unicode: Union[bool, None] = None
+    ) -> List[FontInfo]:
+        """
+            Returns the fonts matching every given criteria
+        """
+
+        return [
+            font for font in self.fonts
+            if (width == None or font.width == width)
+            and (height == None or font.height == height)
+            and font.length >= min_length
+            and (unicode == None or font.unicode == unicode)
+        ]
@@ -0,0 +1,271 @@
+"""guest memory dump module, decoding GDT/IDT descriptors"""
+
+import mmap
+
+from typing import List
+from typing import Self
+from typing import Union
+from dataclasses import replace
+from dataclasses import dataclass
+from struct import iter_unpack
+
+from .gdt import Gdt
+from .gdt import GdtEntry
+from .gdt import GdtAccessByte
+
+from .exceptions.exception import OtError
+
+# limit_0_15, base_0_15, base_16_23, access, flags | limit_16_19, base_24_31
+GDT_ENTRY_FORMAT = "<HHBBBB"
+# offset_0_15, selector, zero, type_attributes, offset_16_31
+IDT_GATE_FORMAT = "<HHBBH"
+
+DESCRIPTOR_SIZE = 8
+
+# Access byte bits set by the CPU at runtime
+ACCESS_ACCESSED = 1 << 0
+ACCESS_TSS_BUSY = 1 << 1
+ACCESS_CODE_DATA = 1 << 4
+# 16 bits and 32 bits TSS system types, available or busy
+TSS_TYPES = (0x1, 0x3, 0x9, 0xb)
+
+@dataclass
+class GdtRow:
+    """
+        Representing a decoded segment descriptor
+    """
+
+    index: int
+    selector: int
+    base: int
+    # 20 bits, not scaled by the granularity
+    limit: int
+    access: int
+    # bits 7-4 of the flags byte (see `GdtFlags`)
+    flags: int
+
+    def to_entry(self) -> GdtEntry:
+        """
+            Returns the equivalent `GdtEntry`
+        """
+
+        return GdtEntry(f"gdt_{self.index}") \
+            .set_access_byte(GdtAccessByte(self.access)) \
+            .set_flags(self.flags) \
+            .set_limit(self.limit) \
+            .set_base(self.base)
+
+@dataclass
+class IdtRow:
+    """
+        Representing a decoded interrupt gate
+    """
+
+    index: int
+    offset: int
+    selector: int
+    type_attributes: int
+
+    def is_present(self) -> bool:
+        """
+            Present bit at pos 7
+        """
+
+        return bool(self.type_attributes & 0x80)
+
+    def get_dpl(self) -> int:
+        """
+            Descriptor Privilege Level at pos 6-5
+        """
+
+        return (self.type_attributes >> 5) & 3
+
+    def get_type(self) -> int:
+        """
+            Gate type at pos 3-0
+        """
+
+        return self.type_attributes & 0xf
+
+@dataclass
+class DescriptorDiff:
+    """
+        Representing a descriptor that differs,
+        None when it is missing from one of the tables
+    """
+
+    index: int
+    expected: Union[GdtRow, None]
+    actual: Union[GdtRow, None]
+
+def decode_gdt(data: bytes) -> List[GdtRow]:
+    """
+        Decode every segment descriptor of `data` in one pass
+    """
+
+    data = memoryview(data)[:len(data) - len(data) % DESCRIPTOR_SIZE]
+
+    return [
+        GdtRow(
+            i,
+            i * DESCRIPTOR_SIZE,
+            base_lo | (base_mid << 16) | (base_hi << 24),
+            limit_lo | ((flags & 0xf) << 16),
+            access,
+            flags & 0xf0
+        )
+        for i, (limit_lo, base_lo, base_mid, access, flags, base_hi)
+        in enumerate(iter_unpack(GDT_ENTRY_FORMAT, data))
+    ]
+
+def decode_idt(data: bytes) -> List[IdtRow]:
+    """
+        Decode every interrupt gate of `data` in one pass
+    """
+
+    data = memoryview(data)[:len(data) - len(data) % DESCRIPTOR_SIZE]
+
+    return [
+        IdtRow(i, offset_lo | (offset_hi << 16), selector, type_attributes)
+        for i, (offset_lo, selector, _, type_attributes, offset_hi)
+        in enumerate(iter_unpack(IDT_GATE_FORMAT, data))
+    ]
+
+def _mask_runtime_bits(row: Union[GdtRow, None]) -> Union[GdtRow, None]:
+    """
+        Returns `row` without the access bits the CPU sets by itself,
+        Accessed for code/data segments and busy for TSS
+    """
+
+    if row == None:
+        return None
+
+    if row.access & ACCESS_CODE_DATA:
+        return replace(row, access=row.access & ~ACCESS_ACCESSED)
+
+    if row.access & 0xf in TSS_TYPES:
+        return replace(row, access=row.access & ~ACCESS_TSS_BUSY)
+
+    return row
+
+def diff_tables(
+    expected: bytes,
+    actual: bytes,
+    strict: bool = False
+) -> List[DescriptorDiff]:
+    """
+        Returns the descriptors that differ between two GDT images.
+
+        Unless `strict`, the Accessed bit of code/data segments and the
+        busy bit of TSS are ignored: the CPU sets them when a segment
+        register is loaded or on `ltr`, so a live table would differ
+        on every loaded descriptor.
+    """
+
+    if expected == actual:
+        return []
+
+    x = decode_gdt(expected)
+    y = decode_gdt(actual)
+    key = (lambda row: row) if strict else _mask_runtime_bits
+    ret = []
+
+    for i in range(max(len(x), len(y))):
+        a = x[i] if i < len(x) else None
+        b = y[i] if i < len(y) else None
+
+        if key(a) != key(b):
+            ret.append(DescriptorDiff(i, a, b))
+
+    return ret
+
+class MemoryDump:
+    """
+        Memory mapped guest physical memory dump (eg. QEMU `dump-guest-memory`
+        or `pmemsave`), `base` is the physical address of its first byte
+    """
+
+    def __init__(self, path: str, base: int = 0):
+        self.base = base
+
+        self.__file = open(path, "rb")
+        self.__map = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """
+            Unmap and close the dump
+        """
+
+        self.__map.close()
+        self.__file.close()
+
+    def __get_view(self, address: int, size: int) -> memoryview:
+        """
+            Returns a zero copy view on [address, address + size),
+            it has to be released before `close`
+        """
+
+        start = address - self.base
+
+        if start < 0 or start + size > len(self.__map):
+            raise OtError("Address range out of the dump")
+
+        return memoryview(self.__map)[start:start + size]
+
+    def get_bytes(self, address: int, size: int) -> bytes:
+        """
+            Returns a copy of [address, address + size)
+        """
+
+        with self.__get_view(address, size) as view:
+            return bytes(view)
+
+    def get_table(self, base: int, limit: int) -> bytes:
+        """
+            Returns a copy of a descriptor table from a GDTR/IDTR
+        """
+
+        return self.get_bytes(base, limit + 1)
+
+    def read_gdt(self, base: int, limit: int) -> List[GdtRow]:
+        """
+            Decode the GDT described by a GDTR, without copying it
+        """
+
+        with self.__get_view(base, limit + 1) as view:
+            return decode_gdt(view)
+
+    def read_gdt_entries(self, base: int, limit: int) -> List[GdtEntry]:
+        """
+            Decode the GDT described by a GDTR as `GdtEntry`
+        """
+
+        return [row.to_entry() for row in self.read_gdt(base, limit)]
+
+    def read_idt(self, base: int, limit: int) -> List[IdtRow]:
+        """
+            Decode the IDT described by an IDTR, without copying it
+        """
+
+        with self.__get_view(base, limit + 1) as view:
+            return decode_idt(view)
+
+    def diff_gdt(
+        self,
+        base: int,
+        limit: int,
+        gdt: Gdt,
+        strict: bool = False
+    ) -> List[DescriptorDiff]:
+        """
+            Returns the descriptors of the dumped GDT
+            that differ from the generated `gdt` (see `diff_tables`)
+        """
+
+        return diff_tables(gdt.to_bytes(), self.get_table(base, limit), strict)
@@ -0,0 +1,297 @@
+"""physical frames bitmap module"""
+
+import re
+
+from enum import Enum
+from typing import List
+from typing import Self
+from dataclasses import dataclass
+
+from .asm.asm import Assembly
+from .asm.label import Label
+from .asm.block import DataBlock
+from .asm.types import TypeValue
+from .asm.types import TypeDouble
+from .asm.types import TypeFormat
+
+from .exceptions.exception import OtError
+
+MEMORY_MAP = "memory_map"
+FRAME_BITMAP = "frame_bitmap"
+
+FRAME_SIZE = 4096
+# 32 bits physical address space
+MAX_ADDRESS = 1 << 32
+
+# Linux boot log line, eg. "BIOS-e820: [mem 0x0-0x9fbff] usable"
+E820_LOG_LINE = re.compile(
+    r"BIOS-e820:\s+\[mem\s+(0x[0-9a-fA-F]+)-(0x[0-9a-fA-F]+)\]\s+(.+?)\s*$"
+)
+# Kernel log timestamp, eg. "[    0.000000] "
+LOG_PREFIX = re.compile(r"^\[\s*\d+\.\d+\]")
+
+class E820Type(Enum):
+    """
+        Available E820 region types
+    """
+
+    USABLE = 1
+    RESERVED = 2
+    ACPI_DATA = 3
+    ACPI_NVS = 4
+    UNUSABLE = 5
+
+E820_NAMES = {
+    "usable": E820Type.USABLE,
+    "reserved": E820Type.RESERVED,
+    "acpi data": E820Type.ACPI_DATA,
+    "acpi nvs": E820Type.ACPI_NVS,
+    "unusable": E820Type.UNUSABLE
+}
+
+@dataclass
+class MemoryRegion:
+    """
+        Representing a physical memory range
+    """
+
+    base: int
+    length: int
+    # E820 type value
+    type: int
+
+    def get_end(self) -> int:
+        """
+            Returns the first address after the region
+        """
+
+        return self.base + self.length
+
+def _parse_type(value: str) -> int:
+    """
+        Returns the E820 type of a name or a number
+    """
+
+    value = value.strip().lower()
+
+    if value in E820_NAMES:
+        return E820_NAMES[value].value
+
+    try:
+        return int(value, 0)
+    except ValueError:
+        return E820Type.RESERVED.value
+
+def _parse_log(lines: List[str]) -> List[MemoryRegion]:
+    """
+        Returns the regions of the BIOS-e820 lines of a boot log,
+        any other line is ignored
+    """
+
+    ret = []
+
+    for line in lines:
+        if not (match := E820_LOG_LINE.search(line)):
+            continue
+
+        base, last, name = match.groups()
+        base = int(base, 16)
+        length = int(last, 16) - base + 1
+
+        ret.append(MemoryRegion(base, length, _parse_type(name)))
+
+    if not ret:
+        raise OtError("No BIOS-e820 line in the boot log")
+
+    return ret
+
+def _parse_map(lines: List[str]) -> List[MemoryRegion]:
+    """
+        Returns the regions of `base length type` lines
+    """
+
+    ret = []
+
+    for line in lines:
+        line = line.split("#")[0].strip()
+
+        if not line:
+            continue
+
+        fields = line.split(None, 2)
+
+        if len(fields) != 3:
+            raise OtError(f"Invalid memory map line: {line}")
+
+        try:
+            base = int(fields[0], 0)
+            length = int(fields[1], 0)
+        except ValueError:
+            raise OtError(f"Invalid memory map line: {line}")
+
+        ret.append(MemoryRegion(base, length, _parse_type(fields[2])))
+
+    return ret
+
+def load_memory_map(path: str) -> List[MemoryRegion]:
+    """
+        Load a memory map, either lines of `base length type`
+        or the BIOS-e820 lines of a Linux boot log
+    """
+
+    with open(path, "r") as f:
+        lines = f.read().splitlines()
+
+    is_log = any(
+        LOG_PREFIX.search(line) or E820_LOG_LINE.search(line)
+        for line in lines
+    )
+
+    return _parse_log(lines) if is_log else _parse_map(lines)
+
+def normalize_regions(regions: List[MemoryRegion]) -> List[MemoryRegion]:
+    """
+        Returns sorted, non overlapping regions, adjacent regions of the
+        same type are merged and any other type wins over usable memory
+    """
+
+    events = []
+
+    for region in regions:
+        if region.length <= 0:
+            continue
+
+        events.append((region.base, 1, region.type))
+        events.append((region.get_end(), -1, region.type))
+
+    events.sort()
+
+    ret = []
+    active = {}
+    position = None
+
+    # Usable memory has the lowest priority
+    priority = lambda _type: (_type != E820Type.USABLE.value, _type)
+
+    for address, delta, _type in events:
+        if position != None and address > position and active:
+            current = max(active, key=priority)
+
+            if ret and ret[-1].type == current and ret[-1].get_end() == position:
+                ret[-1].length += address - position
+            else:
+                ret.append(MemoryRegion(position, address - position, current))
+
+        active[_type] = active.get(_type, 0) + delta
+
+        if active[_type] == 0:
+            del active[_type]
+
+        position = address
+
+    return ret
+
+class FrameBitmap(Assembly):
+    """
+        Precomputed physical frame allocator bitmap
+        and sorted memory map table.
+
+        Bit n (little endian) describes the frame n,
+        set (1) if used, clear (0) if free. The padding bits
+        after the last frame are set.
+    """
+
+    def __init__(
+        self,
+        regions: List[MemoryRegion],
+        frame_size: int = FRAME_SIZE,
+        max_address: int = MAX_ADDRESS
+    ):
+        super().__init__()
+
+        if frame_size < 1 or frame_size & (frame_size - 1):
+            raise OtError("Frame size has to be a power of two")
+
+        self.frame_size = frame_size
+        self.max_address = max_address
+        self.regions = normalize_regions(regions)
+
+        end = max((region.get_end() for region in self.regions), default=0)
+        end = min(end, max_address)
+
+        self.frames = -(-end // frame_size)
+        self.__bitmap = self.__build()
+
+    def __build(self) -> bytes:
+        """
+            Computes the bitmap with whole range masks
+        """
+
+        free = 0
+
+        for region in self.regions:
+            if region.type != E820Type.USABLE.value:
+                continue
+
+            # Only the frames fully inside the region are free
+            first = -(-region.base // self.frame_size)
+            last = min(region.get_end(), self.max_address) // self.frame_size
+
+            if last > first:
+                free |= ((1 << (last - first)) - 1) << first
+
+        size = -(-self.frames // 32) * 4
+        # The padding frames do not exist, they are never free
+        used = ~free & ((1 << (size * 8)) - 1)
+
+        return used.to_bytes(size, "little")
+
+    def get_bitmap(self) -> bytes:
+        """
+            Returns the raw bitmap, padded to 32 bits
+        """
+
+        return self.__bitmap
+
+    def get_free_frames(self) -> int:
+        """
+            Returns the amount of free frames
+        """
+
+        used = int.from_bytes(self.__bitmap, "little").bit_count()
+
+        return len(self.__bitmap) * 8 - used
+
+    def parse(self) -> Self:
+        """
+            Filling the assembly storage
+        """
+
+        self.clear_store()
+
+        table = DataBlock(4, TypeFormat.HEX, 5)
+
+        for region in self.regions:
+            table.extend((
+                region.base & 0xffffffff,
+                region.base >> 32,
+                region.length & 0xffffffff,
+                region.length >> 32,
+                region.type
+            ))
+
+        self.add_label(
+            Label(MEMORY_MAP)
+            .set_align(4)
+            .add(TypeDouble(TypeValue(len(self.regions), TypeFormat.DEFAULT)))
+            .add(table)
+        )
+
+        self.add_label(
+            Label(FRAME_BITMAP)
+            .set_align(4)
+            .add(TypeDouble(TypeValue(self.frames, TypeFormat.DEFAULT)))
+            .add(DataBlock(4, TypeFormat.HEX, 8, self.__bitmap))
+        )
+
+        return self
@@ -9,6 +9,7 @@ from typing import Union
 
 from .asm.asm import Assembly
 from .asm.label import Label
+from .asm.label import ALIGN_DESCRIPTOR
 from .asm.types import TypeByte
 from .asm.types import TypeWord
 from .asm.types import TypeDouble
@@ -70,7 +71,7 @@ class GdtAccessByte:
             3 = lowest privilege (user applications).
         """
         
-        self.__value | permission.value
+        self.__value = (self.__value & ~0x60) | (permission.value & 0x60)
         
         return self
     
@@ -302,15 +303,17 @@ class GdtEntry(Label):
                 )
             )
 
-    def set_base(self, value: int):
+    def set_base(self, value: int) -> Self:
         """
             Set the 32 bits linear address,
             where the segment begins
         """
         
         self.__base_0_15 = value & 0xffff
-        self.__base_16_23 = (value >> 8) & 0xff
-        self.__base_24_31 = (value >> 16) & 0xff
+        self.__base_16_23 = (value >> 16) & 0xff
+        self.__base_24_31 = (value >> 24) & 0xff
+        
+        return self
     
     def set_access_byte(self, value: GdtAccessByte) -> Self:
         """
@@ -332,6 +335,47 @@ class GdtEntry(Label):
             self.__flags = value()
         
         return self
+    
+    def set_limit(self, value: int) -> Self:
+        """
+            Set the 20 bits segment limit,
+            bits 19-16 are the low nibble of the flags byte
+        """
+        
+        self.__segment_limit = value & 0xffff
+        self.__flags = (self.__flags & 0xf0) | ((value >> 16) & 0xf)
+        
+        return self
+    
+    def get_base(self) -> int:
+        """
+            Returns the 32 bits linear address
+        """
+        
+        return self.__base_0_15 \
+            | (self.__base_16_23 << 16) \
+            | (self.__base_24_31 << 24)
+    
+    def get_limit(self) -> int:
+        """
+            Returns the 20 bits segment limit
+        """
+        
+        return self.__segment_limit | ((self.__flags & 0xf) << 16)
+    
+    def get_access_byte(self) -> GdtAccessByte:
+        """
+            Returns the access byte
+        """
+        
+        return GdtAccessByte(self.__access_byte)
+    
+    def get_flags(self) -> int:
+        """
+            Returns the flags byte, limit bits 19-16 included
+        """
+        
+        return self.__flags
 
 class Gdt(Assembly):
     """
@@ -341,7 +385,7 @@ class Gdt(Assembly):
     def __init__(self):
         super().__init__()
         
-        self.add_label(Label(GDT_START))
+        self.add_label(Label(GDT_START).set_align(ALIGN_DESCRIPTOR))
         self.__add_null_entry()
         
     def __add_null_entry(self) -> Self:
@@ -380,6 +424,16 @@ class Gdt(Assembly):
         
         return self
     
+    def to_bytes(self) -> bytes:
+        """
+            Returns the binary table, from `GDT_START` to `GDT_END`.
+            
+            The descriptor is left out, it needs the linear address
+            of the table.
+        """
+        
+        return super().to_bytes((GDT_DESCRIPTOR,))
+    
     def add_descriptor(self) -> Self:
         """
             Add the GDT descriptor automatically
@@ -0,0 +1,194 @@
+"""flat boot image module"""
+
+import os
+import mmap
+
+from typing import Any
+from typing import Self
+from typing import List
+from typing import Union
+from dataclasses import dataclass
+
+from .utils.header import CHeader
+
+from .exceptions.exception import OtError
+
+IMAGE_PREFIX = "IMAGE"
+
+@dataclass
+class ImageSymbol:
+    """
+        Representing an artifact placed in the image
+    """
+
+    name: str
+    offset: int
+    size: int
+
+class ImageArtifact:
+    """
+        Representing an artifact to place,
+        `source` is a file path, bytes or an obj implementing `to_bytes`
+        (`Psf`, `Gdt`, any `Assembly`)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        source: Union[str, bytes, Any],
+        offset: Union[int, None] = None,
+        align: int = 1
+    ):
+        # Keep the alignment of the labels inside the artifact
+        if hasattr(source, "get_align"):
+            align = max(align, source.get_align())
+
+        if align < 1 or align & (align - 1):
+            raise OtError("Alignment has to be a power of two")
+
+        self.name = name
+        self.offset = offset
+        self.align = align
+
+        if isinstance(source, str):
+            self.path = source
+            self.data = None
+            self.size = os.path.getsize(source)
+        else:
+            self.path = None
+            self.data = source if isinstance(source, bytes) \
+                else source.to_bytes()
+            self.size = len(self.data)
+
+    def write(self, image: mmap.mmap, offset: int):
+        """
+            Copy the artifact into the `image` slice at `offset`
+        """
+
+        end = offset + self.size
+
+        if self.data != None:
+            image[offset:end] = self.data
+
+            return
+
+        if self.size == 0:
+            return
+
+        with open(self.path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as src:
+                image[offset:end] = src
+
+class FlatImage:
+    """
+        Lays out generated artifacts into one flat image
+    """
+
+    def __init__(self, size: Union[int, None] = None):
+        self.size = size
+        self.__artifacts = []
+
+    def add_artifact(
+        self,
+        name: str,
+        source: Union[str, bytes, Any],
+        offset: Union[int, None] = None,
+        align: int = 1
+    ) -> Self:
+        """
+            Add an artifact, at a fixed `offset` or after the previous one
+            aligned on `align` bytes
+        """
+
+        if name in (artifact.name for artifact in self.__artifacts):
+            raise OtError("Artifact name has to be unique")
+
+        self.__artifacts.append(ImageArtifact(name, source, offset, align))
+
+        return self
+
+    def layout(self) -> List[ImageSymbol]:
+        """
+            Returns the placement of every artifact
+        """
+
+        ret = []
+        cursor = 0
+
+        for artifact in self.__artifacts:
+            if artifact.offset == None:
+                offset = -(-cursor // artifact.align) * artifact.align
+            else:
+                offset = artifact.offset
+
+                if offset % artifact.align:
+                    raise OtError(f"{artifact.name} is misaligned")
+
+            ret.append(ImageSymbol(artifact.name, offset, artifact.size))
+            cursor = max(cursor, offset + artifact.size)
+
+        placed = sorted(ret, key=lambda symbol: symbol.offset)
+
+        for a, b in zip(placed, placed[1:]):
+            if a.offset + a.size > b.offset:
+                raise OtError(f"{a.name} overlaps {b.name}")
+
+        if self.size != None and cursor > self.size:
+            raise OtError("Artifacts exceed the image size")
+
+        return ret
+
+    def get_size(self) -> int:
+        """
+            Returns the image size
+        """
+
+        if self.size != None:
+            return self.size
+
+        return max(
+            (symbol.offset + symbol.size for symbol in self.layout()),
+            default=0
+        )
+
+    def save(self, path: str):
+        """
+            Preallocate the image at `path`,
+            then write every artifact through its mmap slice
+        """
+
+        symbols = self.layout()
+        size = self.get_size()
+
+        with open(path, "w+b") as f:
+            f.truncate(size)
+
+            if size == 0:
+                return
+
+            with mmap.mmap(f.fileno(), size) as image:
+                for artifact, symbol in zip(self.__artifacts, symbols):
+                    artifact.write(image, symbol.offset)
+
+                image.flush()
+
+    def get_header(self, prefix: str = IMAGE_PREFIX) -> str:
+        """
+            Returns a C header with the offset and size of every artifact
+        """
+
+        ret = CHeader(prefix).add_define("SIZE", self.get_size())
+
+        for symbol in self.layout():
+            ret.add_define(f"{symbol.name}_OFFSET", symbol.offset)
+            ret.add_define(f"{symbol.name}_SIZE", symbol.size)
+
+        return str(ret)
+
+    def save_header(self, path: str, prefix: str = IMAGE_PREFIX):
+        """
+            Dump the C header into `path`
+        """
+
+        with open(path, "w") as f:
+            f.write(self.get_header(prefix))
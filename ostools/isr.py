@@ -0,0 +1,206 @@
+"""interrupt stubs machine code module
+
+Encodes the stubs of `scripts/isr_macros.py` directly, without NASM:
+
+    isrN:   cli
+            push 0          ; only without an error code
+            push N
+            jmp isr_common_stub
+
+    irqN:   cli
+            push N
+            push N + 32
+            jmp irq_common_stub
+"""
+
+from typing import Self
+from typing import List
+from typing import Union
+from struct import pack
+
+from .asm.asm import Assembly
+from .asm.label import Label
+from .asm.block import DataBlock
+from .asm.types import TypeFormat
+
+from .utils.header import CHeader
+
+from .exceptions.exception import OtError
+
+# Exceptions pushing an error code
+ISR_ERRORS = (8, 10, 11, 12, 13, 14, 17, 18, 21)
+
+ISR_COUNT = 256
+IRQ_COUNT = 16
+IRQ_BASE = 32
+
+ISR_PREFIX = "ISR_STUBS"
+
+# Biggest stub is 13 bytes
+ISR_STUB_STRIDE = 16
+
+OPCODE_CLI = 0xfa
+OPCODE_PUSH_IMM8 = 0x6a
+OPCODE_PUSH_IMM32 = 0x68
+OPCODE_JMP_REL32 = 0xe9
+OPCODE_INT3 = 0xcc
+
+class I686Encoder:
+    """
+        Containing the few i686 instructions of the stubs
+    """
+
+    def cli() -> bytes:
+        """
+            cli
+        """
+
+        return bytes([OPCODE_CLI])
+
+    def push(value: int) -> bytes:
+        """
+            push imm8 (sign extended) or push imm32
+        """
+
+        if -0x80 <= value <= 0x7f:
+            return pack("<Bb", OPCODE_PUSH_IMM8, value)
+
+        return pack("<BI", OPCODE_PUSH_IMM32, value & 0xffffffff)
+
+    def jmp(address: int, target: int) -> bytes:
+        """
+            jmp rel32, the instruction being at `address`.
+            EIP wraps modulo 2^32, every target is reachable.
+        """
+
+        rel = (target - (address + 5)) & 0xffffffff
+
+        return pack("<BI", OPCODE_JMP_REL32, rel)
+
+class IsrStubs(Assembly):
+    """
+        The 272 ISR/IRQ stubs as raw machine code, linked at `base`.
+
+        With a `stride`, every stub starts at `base + n * stride`
+        (isr0-255 then irq0-15), padded with int3.
+    """
+
+    def __init__(
+        self,
+        base: int,
+        isr_common: int,
+        irq_common: int,
+        stride: Union[int, None] = ISR_STUB_STRIDE
+    ):
+        super().__init__()
+
+        self.base = base
+        self.isr_common = isr_common
+        self.irq_common = irq_common
+        self.stride = stride
+
+    def __encode(self, address: int, values: List[int], target: int) -> bytes:
+        """
+            Encode a stub located at `address`
+        """
+
+        ret = I686Encoder.cli()
+
+        for value in values:
+            ret += I686Encoder.push(value)
+
+        ret += I686Encoder.jmp(address + len(ret), target)
+
+        if self.stride == None:
+            return ret
+
+        if len(ret) > self.stride:
+            raise OtError("Stub bigger than the stride")
+
+        return ret + bytes([OPCODE_INT3] * (self.stride - len(ret)))
+
+    def get_stubs(self) -> List[tuple]:
+        """
+            Returns (name, pushed values, jump target) of every stub
+        """
+
+        ret = []
+
+        for i in range(ISR_COUNT):
+            values = [i] if i in ISR_ERRORS else [0, i]
+            ret.append((f"isr{i}", values, self.isr_common))
+
+        for i in range(IRQ_COUNT):
+            ret.append((f"irq{i}", [i, i + IRQ_BASE], self.irq_common))
+
+        return ret
+
+    def parse(self) -> Self:
+        """
+            Filling the assembly storage, one label per stub
+        """
+
+        self.clear_store()
+
+        address = self.base
+
+        for name, values, target in self.get_stubs():
+            code = self.__encode(address, values, target)
+
+            self.add_label(
+                Label(name).add(DataBlock(1, TypeFormat.HEX, 16, code))
+            )
+
+            address += len(code)
+
+        return self
+
+    def get_address(self, index: int) -> int:
+        """
+            Returns the address of the stub `index` (isr0-255, irq0-15),
+            arithmetic with a stride
+        """
+
+        if self.stride == None:
+            symbol = self.get_symbols()[index]
+
+            return self.base + symbol.offset
+
+        return self.base + index * self.stride
+
+    def get_header(self, prefix: str = ISR_PREFIX) -> str:
+        """
+            Returns a C header with the stubs addresses
+        """
+
+        ret = CHeader(prefix).add_define("BASE", self.base)
+
+        if self.stride != None:
+            ret.add_define("STRIDE", str(self.stride)).add_macro(
+                "ADDRESS",
+                "n",
+                f"{prefix}_BASE + (n) * {prefix}_STRIDE"
+            )
+
+        ret.add_blank()
+
+        for symbol in self.get_symbols():
+            ret.add_define(symbol.name, self.base + symbol.offset)
+
+        return str(ret)
+
+    def save(self, path: str):
+        """
+            Dump the raw machine code into `path`
+        """
+
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    def save_header(self, path: str, prefix: str = ISR_PREFIX):
+        """
+            Dump the C header into `path`
+        """
+
+        with open(path, "w") as f:
+            f.write(self.get_header(prefix))
@@ -1,17 +1,29 @@
 """psf module"""
 
+import gzip
+import zlib
+
+from enum import Enum
+from typing import Dict
+from typing import BinaryIO
 from typing import List
 from typing import Tuple
 from typing import Self
+from typing import Union
 from dataclasses import dataclass
 from struct import unpack
+from struct import iter_unpack
 
 from .exceptions.exception import OtError
 from .asm.asm import Assembly
 from .asm.label import Label
-from .asm.types import TypeValue
-from .asm.types import TypeByte
+from .asm.label import ALIGN_CACHE_LINE
+from .asm.block import DataBlock
 from .asm.types import TypeFormat
+from .tables import bit_reverse_table
+from .unicode import UnicodeLayout
+from .unicode import UnicodeTableReport
+from .unicode import UNICODE_LAYOUTS
 
 FONT_START = "font_start"
 
@@ -36,6 +48,13 @@ class PsfHeader:
         """
         
         raise OtError("Not implemented")
+    
+    def has_unicode_table(self) -> bool:
+        """
+            Returns if a Unicode table follows the glyphs
+        """
+        
+        raise OtError("Not implemented")
 
 ########
 # PSF1 #
@@ -83,7 +102,13 @@ class Psf1Header(PsfHeader):
         return (8, self.char_size)
 
     def get_length(self) -> int:
+        if self.mode & PSF1_MODE512:
+            return 512
+
         return 256
+    
+    def has_unicode_table(self) -> bool:
+        return bool(self.mode & PSF1_MODEHASTAB)
 
 ########
 # PSF2 #
@@ -144,7 +169,7 @@ class Psf2Header(PsfHeader):
         )
     
     def __sizeof__(self) -> int:
-        return 32
+        return self.header_size
 
     def get_dimensions(self) -> Tuple[int, int]:
         """
@@ -155,6 +180,78 @@ class Psf2Header(PsfHeader):
     
     def get_length(self) -> int:
         return self.length
+    
+    def has_unicode_table(self) -> bool:
+        return bool(self.flags & PSF2_HAS_UNICODE_TABLE)
+
+# gzip compressed fonts, eg. /usr/share/consolefonts/*.psf.gz
+GZIP_MAGIC_BYTES = bytes([0x1f, 0x8b])
+
+def open_font(filepath: str) -> BinaryIO:
+    """
+        Open a raw or gzip compressed font,
+        a compressed one is decompressed while it is read
+    """
+    
+    with open(filepath, "rb") as f:
+        magic = f.read(2)
+    
+    if magic == GZIP_MAGIC_BYTES:
+        return gzip.open(filepath, "rb")
+    
+    return open(filepath, "rb")
+
+def read_font(filepath: str, size: int = -1) -> bytes:
+    """
+        Returns the first `size` bytes (everything by default)
+        of a raw or gzip compressed font
+    """
+    
+    try:
+        with open_font(filepath) as f:
+            return f.read(size)
+    except (gzip.BadGzipFile, zlib.error, EOFError) as e:
+        raise OtError(f"Corrupted compressed font: {e}") from e
+
+def read_header(buffer: bytes) -> PsfHeader:
+    """
+        Parse the header at the start of `buffer`
+    """
+    
+    if len(buffer) < 4:
+        raise OtError("File content isnt enough long")
+    
+    if (magic := buffer[:2]) == PSF1_MAGIC_BYTES:
+        return Psf1Header(
+            magic,
+            *list(unpack("BB", buffer[2:4]))
+        )
+    
+    if (magic := buffer[:4]) == PSF2_MAGIC_BYTES:
+        if len(buffer) < 32:
+            raise OtError("File content isnt enough long")
+        
+        return Psf2Header(
+            magic,
+            *list(unpack("<IIIIIII", buffer[4:32]))
+        )
+    
+    raise OtError("Invalid file")
+
+def probe_header(filepath: str) -> PsfHeader:
+    """
+        Parse the header of a font without loading the glyphs
+    """
+    
+    return read_header(read_font(filepath, 32))
+
+class GlyphBitOrder(Enum):
+    """
+        Position of the leftmost pixel in a glyph row
+    """
+    
+    MSB = 0
+    LSB = 1
 
 class Psf(Assembly):
     """
@@ -164,25 +261,8 @@ class Psf(Assembly):
     def __init__(self, filepath: str):
         super().__init__()
         
-        with open(filepath, "rb") as f:
-            self.__buffer = f.read()
-        
-        if len(self.__buffer) < 2:
-            raise OtError("File content isnt enough long")
-        
-        if (magic := self.__buffer[:2]) == PSF1_MAGIC_BYTES:        
-            self.header = Psf1Header(
-                magic,
-                self.__buffer[2],
-                *list(unpack("BB", self.__buffer[2:4]))
-            )
-        elif (magic := self.__buffer[:4]) == PSF2_MAGIC_BYTES:
-            self.header = Psf2Header(
-                magic,
-                *list(unpack("<iiiiiii", self.__buffer[4:32]))
-            )
-        else:
-            raise OtError("Invalid file")
+        self.__buffer = read_font(filepath)
+        self.header = read_header(self.__buffer)
 
         self.offset = self.header.__sizeof__()
         self.glyphs_size = self.header.get_length() * self.header.char_size
@@ -217,26 +297,176 @@ class Psf(Assembly):
         
         return self.__buffer[self.offset:self.offset + self.glyphs_size]
 
-    def parse(self) -> Self:
+    def __get_psf1_unicode(self, table: bytes) -> Dict[int, int]:
+        """
+            Decode a PSF1 Unicode table (u16 codepoints)
+        """
+        
+        ret = {}
+        glyph = 0
+        in_sequence = False
+        
+        for (value,) in iter_unpack("<H", table[:len(table) & ~1]):
+            if value == PSF1_SEPARATOR:
+                glyph += 1
+                in_sequence = False
+            elif value == PSF1_STARTSEQ:
+                in_sequence = True
+            elif not in_sequence:
+                ret.setdefault(value, glyph)
+        
+        return ret
+    
+    def __get_psf2_unicode(self, table: bytes) -> Dict[int, int]:
+        """
+            Decode a PSF2 Unicode table (UTF-8 codepoints)
+        """
+        
+        ret = {}
+        
+        for glyph, entry in enumerate(table.split(bytes([PSF2_SEPARATOR]))):
+            # Only single codepoints are mapped, sequences are skipped
+            entry = entry.split(bytes([PSF2_STARTSEQ]))[0]
+            
+            for char in entry.decode("utf-8", "ignore"):
+                ret.setdefault(ord(char), glyph)
+        
+        return ret
+    
+    def get_unicode_table(self) -> Dict[int, int]:
+        """
+            Returns the codepoint -> glyph index mapping
+            of the Unicode table
+        """
+        
+        if not self.header.has_unicode_table():
+            raise OtError("No Unicode table")
+        
+        table = self.__buffer[self.offset + self.glyphs_size:]
+        
+        if isinstance(self.header, Psf1Header):
+            ret = self.__get_psf1_unicode(table)
+        else:
+            ret = self.__get_psf2_unicode(table)
+        
+        length = self.header.get_length()
+        
+        return {k: v for k, v in ret.items() if v < length}
+    
+    def get_unicode_reports(self) -> List[UnicodeTableReport]:
+        """
+            Returns the report of every kernel lookup layout
+        """
+        
+        table = self.get_unicode_table()
+        
+        return [
+            UNICODE_LAYOUTS[layout](table).get_report()
+            for layout in UnicodeLayout
+        ]
+    
+    def add_unicode_table(
+        self,
+        layout: UnicodeLayout = UnicodeLayout.HASH
+    ) -> Self:
+        """
+            Emit a kernel lookup table mapping codepoints
+            to glyph indexes, has to be called after `parse`
+        """
+        
+        table = UNICODE_LAYOUTS[layout](self.get_unicode_table())
+        
+        for label in table.get_labels():
+            self.add_label(label)
+        
+        return self
+
+    def get_stride(self) -> int:
+        """
+            Returns the bytes amount of a glyph row,
+            rows are padded to whole bytes
+        """
+        
+        w, _ = self.header.get_dimensions()
+        
+        return (w + 7) // 8
+    
+    def __get_rows(self, row_width: int, bit_order: GlyphBitOrder) -> bytes:
+        """
+            Returns the glyph rows, each one padded to `row_width` bytes
+        """
+        
+        data = self.get_chars()
+        stride = self.get_stride()
+        
+        if bit_order == GlyphBitOrder.LSB:
+            data = data.translate(bit_reverse_table())
+        
+        if stride == row_width:
+            return data
+        
+        pad = bytes(row_width - stride)
+        
+        return b"".join(
+            data[i:i + stride] + pad
+            for i in range(0, len(data), stride)
+        )
+
+    def parse(
+        self,
+        row_width: int = 1,
+        bit_order: GlyphBitOrder = GlyphBitOrder.MSB,
+        byteorder: Union[str, None] = None
+    ) -> Self:
         """
             Filling the assembly storage
+            
+            With a `row_width` of 2 or 4, every glyph row is packed
+            into a single `dw`/`dd`. `bit_order` places the leftmost pixel
+            in the most (MSB) or least (LSB) significant bit, `byteorder`
+            tells how the row bytes form the word, by default "big" for MSB
+            and "little" for LSB.
         """
 
+        if not byteorder in (None, "big", "little"):
+            raise OtError("Byte order has to be \"big\" or \"little\"")
+
         # Avoid duplicates if multiples calls
         self.clear_store()
-        self.add_label(Label(FONT_START))
+        self.add_label(Label(FONT_START).set_align(ALIGN_CACHE_LINE))
         
-        w, _ = self.header.get_dimensions()
+        stride = self.get_stride()
         
-        for i in range(0, self.glyphs_size, self.header.char_size):
-            char = self.get_char(i)
+        if row_width == 1:
+            # One columnar block for the whole font, one row per line
+            self.add(
+                DataBlock(
+                    1,
+                    TypeFormat.BIN_FILL,
+                    stride,
+                    self.__get_rows(stride, bit_order)
+                )
+            )
             
-            for ii in range(0, len(char), w // 8):
-                line = char[ii:ii + (w // 8)]
-                tv = lambda x: TypeValue(x, TypeFormat.BIN_FILL)
-
-                line = list(map(tv, line))
-                
-                self.add(TypeByte(*line))
+            return self
+        
+        if not row_width in (2, 4) or stride > row_width:
+            raise OtError("Rows dont fit in the row width")
+        
+        if byteorder == None:
+            byteorder = "big" if bit_order == GlyphBitOrder.MSB else "little"
+        
+        block = DataBlock(
+            row_width,
+            TypeFormat.BIN_FILL,
+            1,
+            self.__get_rows(row_width, bit_order)
+        )
+        
+        # The block reads its buffer as little endian words
+        if byteorder == "big":
+            block.get_values().byteswap()
+        
+        self.add(block)
         
-        return self
\ No newline at end of file
+        return self
@@ -0,0 +1,310 @@
+"""precomputed kernel lookup tables module"""
+
+from typing import List
+from typing import Self
+from typing import Iterable
+
+from .asm.asm import Assembly
+from .asm.asm import AsmSymbol
+from .asm.label import Label
+from .asm.label import ALIGN_CACHE_LINE
+from .asm.block import DataBlock
+from .asm.types import TypeFormat
+
+from .exceptions.exception import OtError
+
+CRC32_POLY = 0xedb88320 # reflected IEEE 802.3
+CRC16_POLY = 0x1021 # CCITT
+
+# PIT input clock (Hz)
+PIT_FREQUENCY = 1193182
+
+class Keycode:
+    """
+        Keycodes of the scancode tables, printable keys are ASCII
+    """
+
+    NONE = 0x00
+    BACKSPACE = 0x08
+    TAB = 0x09
+    ENTER = 0x0a
+    ESCAPE = 0x1b
+    LCTRL = 0x80
+    LSHIFT = 0x81
+    RSHIFT = 0x82
+    LALT = 0x83
+    CAPSLOCK = 0x84
+    NUMLOCK = 0x85
+    SCROLLLOCK = 0x86
+    # F1 to F12 are contiguous
+    F1 = 0x90
+
+_K = Keycode
+
+# US QWERTY layout, (normal, shifted) keycode of each set 1 make code
+SCANCODES_SET1 = {
+    0x01: (_K.ESCAPE, _K.ESCAPE),
+    **{0x02 + i: (ord(a), ord(b)) for i, (a, b) in enumerate(zip(
+        "1234567890-=", "!@#$%^&*()_+"
+    ))},
+    0x0e: (_K.BACKSPACE, _K.BACKSPACE),
+    0x0f: (_K.TAB, _K.TAB),
+    **{0x10 + i: (ord(a), ord(b)) for i, (a, b) in enumerate(zip(
+        "qwertyuiop[]", "QWERTYUIOP{}"
+    ))},
+    0x1c: (_K.ENTER, _K.ENTER),
+    0x1d: (_K.LCTRL, _K.LCTRL),
+    **{0x1e + i: (ord(a), ord(b)) for i, (a, b) in enumerate(zip(
+        "asdfghjkl;'`", "ASDFGHJKL:\"~"
+    ))},
+    0x2a: (_K.LSHIFT, _K.LSHIFT),
+    **{0x2b + i: (ord(a), ord(b)) for i, (a, b) in enumerate(zip(
+        "\\zxcvbnm,./", "|ZXCVBNM<>?"
+    ))},
+    0x36: (_K.RSHIFT, _K.RSHIFT),
+    0x37: (ord("*"), ord("*")),
+    0x38: (_K.LALT, _K.LALT),
+    0x39: (ord(" "), ord(" ")),
+    0x3a: (_K.CAPSLOCK, _K.CAPSLOCK),
+    **{0x3b + i: (_K.F1 + i, _K.F1 + i) for i in range(10)},
+    0x45: (_K.NUMLOCK, _K.NUMLOCK),
+    0x46: (_K.SCROLLLOCK, _K.SCROLLLOCK),
+    **{0x47 + i: (ord(a), ord(a)) for i, a in enumerate("789-456+1230.")},
+    0x57: (_K.F1 + 10, _K.F1 + 10),
+    0x58: (_K.F1 + 11, _K.F1 + 11)
+}
+
+# set 2 make code -> set 1 make code, for the single byte make codes
+SET2_TO_SET1 = {
+    0x76: 0x01, 0x16: 0x02, 0x1e: 0x03, 0x26: 0x04, 0x25: 0x05, 0x2e: 0x06,
+    0x36: 0x07, 0x3d: 0x08, 0x3e: 0x09, 0x46: 0x0a, 0x45: 0x0b, 0x4e: 0x0c,
+    0x55: 0x0d, 0x66: 0x0e, 0x0d: 0x0f, 0x15: 0x10, 0x1d: 0x11, 0x24: 0x12,
+    0x2d: 0x13, 0x2c: 0x14, 0x35: 0x15, 0x3c: 0x16, 0x43: 0x17, 0x44: 0x18,
+    0x4d: 0x19, 0x54: 0x1a, 0x5b: 0x1b, 0x5a: 0x1c, 0x14: 0x1d, 0x1c: 0x1e,
+    0x1b: 0x1f, 0x23: 0x20, 0x2b: 0x21, 0x34: 0x22, 0x33: 0x23, 0x3b: 0x24,
+    0x42: 0x25, 0x4b: 0x26, 0x4c: 0x27, 0x52: 0x28, 0x0e: 0x29, 0x12: 0x2a,
+    0x5d: 0x2b, 0x1a: 0x2c, 0x22: 0x2d, 0x21: 0x2e, 0x2a: 0x2f, 0x32: 0x30,
+    0x31: 0x31, 0x3a: 0x32, 0x41: 0x33, 0x49: 0x34, 0x4a: 0x35, 0x59: 0x36,
+    0x7c: 0x37, 0x11: 0x38, 0x29: 0x39, 0x58: 0x3a, 0x05: 0x3b, 0x06: 0x3c,
+    0x04: 0x3d, 0x0c: 0x3e, 0x03: 0x3f, 0x0b: 0x40, 0x83: 0x41, 0x0a: 0x42,
+    0x01: 0x43, 0x09: 0x44, 0x77: 0x45, 0x7e: 0x46, 0x6c: 0x47, 0x75: 0x48,
+    0x7d: 0x49, 0x7b: 0x4a, 0x6b: 0x4b, 0x73: 0x4c, 0x74: 0x4d, 0x79: 0x4e,
+    0x69: 0x4f, 0x72: 0x50, 0x7a: 0x51, 0x70: 0x52, 0x71: 0x53, 0x78: 0x57,
+    0x07: 0x58
+}
+
+def crc32_table(poly: int = CRC32_POLY) -> List[int]:
+    """
+        Returns the reflected (LSB first) CRC32 table
+    """
+
+    ret = list(range(256))
+
+    # Every entry is shifted at once, 8 times
+    for _ in range(8):
+        ret = [(x >> 1) ^ (poly if x & 1 else 0) for x in ret]
+
+    return ret
+
+def crc16_table(poly: int = CRC16_POLY) -> List[int]:
+    """
+        Returns the MSB first CRC16 table
+    """
+
+    ret = [x << 8 for x in range(256)]
+
+    for _ in range(8):
+        ret = [
+            ((x << 1) ^ (poly if x & 0x8000 else 0)) & 0xffff
+            for x in ret
+        ]
+
+    return ret
+
+def bit_reverse_table() -> bytes:
+    """
+        Returns the byte -> bit reversed byte table
+    """
+
+    return bytes(int(f"{x:08b}"[::-1], 2) for x in range(256))
+
+def popcount_table() -> bytes:
+    """
+        Returns the byte -> set bits amount table
+    """
+
+    return bytes(x.bit_count() for x in range(256))
+
+def pit_divisors(frequencies: Iterable[int]) -> List[int]:
+    """
+        Returns the PIT reload value of every frequency (Hz),
+        65536 is encoded as 0
+    """
+
+    ret = []
+
+    for frequency in frequencies:
+        if frequency <= 0:
+            raise OtError("Invalid frequency")
+
+        divisor = round(PIT_FREQUENCY / frequency)
+
+        if not 1 <= divisor <= 0x10000:
+            raise OtError(f"No PIT divisor for {frequency} Hz")
+
+        ret.append(divisor & 0xffff)
+
+    return ret
+
+def scancode_table(scancode_set: int = 1, shifted: bool = False) -> bytes:
+    """
+        Returns the make code -> keycode table of a PS/2 scancode set
+    """
+
+    match scancode_set:
+        case 1:
+            codes = {code: code for code in SCANCODES_SET1}
+        case 2:
+            codes = SET2_TO_SET1
+        case _:
+            raise OtError("Only the sets 1 and 2 are supported")
+
+    ret = bytearray(max(codes) + 1)
+
+    for code, set1 in codes.items():
+        ret[code] = SCANCODES_SET1[set1][int(shifted)]
+
+    return bytes(ret)
+
+class LookupTables(Assembly):
+    """
+        Emits lookup tables, identical tables are only emitted once
+        and the duplicates are aliased with `equ`
+    """
+
+    def __init__(self):
+        super().__init__()
+
+        self.__tables = {}
+        # alias -> aliased table name
+        self.__aliases = {}
+
+    def clear_store(self):
+        """
+            Reset the storage, the known tables and aliases
+        """
+
+        super().clear_store()
+
+        self.__tables.clear()
+        self.__aliases.clear()
+
+    def add_label(self, obj: Label) -> Self:
+        """
+            Add a label, its name cannot be an alias
+        """
+
+        if obj.name in self.__aliases:
+            raise OtError("Label has to be unique")
+
+        return super().add_label(obj)
+
+    def get_symbols(self) -> List[AsmSymbol]:
+        """
+            Returns the symbol table, an alias shares
+            the symbol of the aliased table
+        """
+
+        symbols = super().get_symbols()
+        by_name = {symbol.name: symbol for symbol in symbols}
+
+        for alias, name in self.__aliases.items():
+            symbol = by_name[name]
+
+            symbols.append(
+                AsmSymbol(alias, symbol.section, symbol.offset, symbol.size)
+            )
+
+        return symbols
+
+    def add_table(
+        self,
+        name: str,
+        block: DataBlock,
+        align: int = ALIGN_CACHE_LINE
+    ) -> Self:
+        """
+            Add a table, aligned on `align` bytes
+        """
+
+        if self.label_exists(Label(name)) or name in self.__aliases:
+            raise OtError(f"Table {name} already exists")
+
+        key = (block.width, block.to_bytes())
+
+        if key in self.__tables:
+            self.__aliases[name] = self.__tables[key]
+
+            return self.add(f"{name} equ {self.__tables[key]}")
+
+        self.__tables[key] = name
+
+        return self.add_label(Label(name).set_align(align).add(block))
+
+    def add_crc32(self, name: str = "crc32_table", poly: int = CRC32_POLY) -> Self:
+        """
+            Add a CRC32 table
+        """
+
+        return self.add_table(name, DataBlock(4, TypeFormat.HEX, 8, crc32_table(poly)))
+
+    def add_crc16(self, name: str = "crc16_table", poly: int = CRC16_POLY) -> Self:
+        """
+            Add a CRC16 table
+        """
+
+        return self.add_table(name, DataBlock(2, TypeFormat.HEX, 8, crc16_table(poly)))
+
+    def add_bit_reverse(self, name: str = "bit_reverse_table") -> Self:
+        """
+            Add the bit reverse table
+        """
+
+        return self.add_table(name, DataBlock(1, TypeFormat.HEX, 16, bit_reverse_table()))
+
+    def add_popcount(self, name: str = "popcount_table") -> Self:
+        """
+            Add the popcount table
+        """
+
+        return self.add_table(name, DataBlock(1, TypeFormat.DEFAULT, 16, popcount_table()))
+
+    def add_scancodes(
+        self,
+        name: str,
+        scancode_set: int = 1,
+        shifted: bool = False
+    ) -> Self:
+        """
+            Add a make code -> keycode table
+        """
+
+        return self.add_table(
+            name,
+            DataBlock(1, TypeFormat.HEX, 16, scancode_table(scancode_set, shifted))
+        )
+
+    def add_pit_divisors(
+        self,
+        name: str,
+        frequencies: Iterable[int]
+    ) -> Self:
+        """
+            Add the PIT reload values of `frequencies`
+        """
+
+        return self.add_table(
+            name,
+            DataBlock(2, TypeFormat.DEFAULT, 8, pit_divisors(frequencies)),
+            2
+        )
@@ -0,0 +1,237 @@
+"""kernel Unicode lookup tables module
+
+Both layouts map a codepoint to a glyph index.
+
+RANGE, binary search the last `starts[i] <= cp`, then
+    if cp - starts[i] < counts[i]: glyph = glyphs[i] + (cp - starts[i])
+
+HASH, minimal perfect hash (hash and displace), with u32 arithmetic
+    hash(seed, cp):
+        x = (cp ^ seed) * 0x9e3779b1
+        x = (x ^ (x >> 16)) * 0x85ebca6b
+    reduce(x, n) = (x * n) >> 32 (high half of the 64 bits product)
+
+    bucket = reduce(hash(0, cp), buckets)
+    slot = reduce(hash(disp[bucket], cp), entries)
+    if keys[slot] == cp: glyph = glyphs[slot]
+"""
+
+from enum import Enum
+from typing import Dict
+from typing import List
+from dataclasses import dataclass
+
+from .asm.label import Label
+from .asm.block import DataBlock
+from .asm.types import TypeValue
+from .asm.types import TypeDouble
+from .asm.types import TypeFormat
+
+from .exceptions.exception import OtError
+
+FONT_UNICODE = "font_unicode"
+
+# Max value of a displacement seed (dw)
+UNICODE_MAX_SEED = 0xffff
+
+class UnicodeLayout(Enum):
+    """
+        Available kernel lookup layouts
+    """
+
+    RANGE = 0
+    HASH = 1
+
+@dataclass
+class UnicodeTableReport:
+    """
+        Representing the cost of a lookup layout
+    """
+
+    layout: UnicodeLayout
+    # ranges or hash slots
+    entries: int
+    # emitted bytes
+    size: int
+    # worst case codepoint comparisons per lookup
+    max_probes: int
+
+def unicode_hash(seed: int, cp: int) -> int:
+    """
+        32 bits hash shared with the kernel
+    """
+
+    x = ((cp ^ seed) * 0x9e3779b1) & 0xffffffff
+    x = ((x ^ (x >> 16)) * 0x85ebca6b) & 0xffffffff
+
+    return x
+
+def unicode_reduce(x: int, n: int) -> int:
+    """
+        Maps a 32 bits hash into [0, n) without division
+    """
+
+    return (x * n) >> 32
+
+class UnicodeRangeTable:
+    """
+        Sorted range compressed table
+    """
+
+    def __init__(self, table: Dict[int, int], name: str = FONT_UNICODE):
+        if not table:
+            raise OtError("Empty Unicode table")
+
+        self.name = name
+        self.starts = []
+        self.counts = []
+        self.glyphs = []
+
+        for cp, glyph in sorted(table.items()):
+            if (
+                self.starts
+                and cp == self.starts[-1] + self.counts[-1]
+                and glyph == self.glyphs[-1] + self.counts[-1]
+                and self.counts[-1] < 0xffff
+            ):
+                self.counts[-1] += 1
+            else:
+                self.starts.append(cp)
+                self.counts.append(1)
+                self.glyphs.append(glyph)
+
+    def get_report(self) -> UnicodeTableReport:
+        """
+            Returns the layout cost
+        """
+
+        entries = len(self.starts)
+
+        return UnicodeTableReport(
+            UnicodeLayout.RANGE,
+            entries,
+            4 + entries * 8,
+            entries.bit_length()
+        )
+
+    def get_labels(self) -> List[Label]:
+        """
+            Returns the labels to emit
+        """
+
+        return [
+            Label(self.name)
+                .set_align(4)
+                .add(TypeDouble(TypeValue(len(self.starts), TypeFormat.DEFAULT))),
+            Label(self.name + "_starts")
+                .set_align(4)
+                .add(DataBlock(4, TypeFormat.HEX, 8, self.starts)),
+            Label(self.name + "_counts")
+                .add(DataBlock(2, TypeFormat.DEFAULT, 8, self.counts)),
+            Label(self.name + "_glyphs")
+                .add(DataBlock(2, TypeFormat.DEFAULT, 8, self.glyphs))
+        ]
+
+class UnicodePerfectHash:
+    """
+        Minimal perfect hash table (hash and displace)
+    """
+
+    def __init__(self, table: Dict[int, int], name: str = FONT_UNICODE):
+        if not table:
+            raise OtError("Empty Unicode table")
+
+        self.name = name
+        self.entries = len(table)
+
+        buckets = max(1, (self.entries + 3) // 4)
+
+        while not self.__build(table, buckets):
+            if buckets >= self.entries:
+                raise OtError("Unable to build a perfect hash")
+
+            buckets = min(self.entries, buckets * 2)
+
+    def __build(self, table: Dict[int, int], buckets: int) -> bool:
+        """
+            Try to place every codepoint with `buckets` buckets
+        """
+
+        groups = [[] for _ in range(buckets)]
+
+        for cp in table:
+            groups[unicode_reduce(unicode_hash(0, cp), buckets)].append(cp)
+
+        self.disp = [0] * buckets
+        self.keys = [0] * self.entries
+        self.glyphs = [0] * self.entries
+
+        used = [False] * self.entries
+
+        # Biggest buckets first, while there is room left
+        order = sorted(range(buckets), key=lambda i: -len(groups[i]))
+
+        for bucket in order:
+            group = groups[bucket]
+
+            if not group:
+                break
+
+            for seed in range(UNICODE_MAX_SEED + 1):
+                slots = set(
+                    unicode_reduce(unicode_hash(seed, cp), self.entries)
+                    for cp in group
+                )
+
+                if len(slots) == len(group) and not any(used[i] for i in slots):
+                    break
+            else:
+                return False
+
+            self.disp[bucket] = seed
+
+            for cp in group:
+                slot = unicode_reduce(unicode_hash(seed, cp), self.entries)
+
+                used[slot] = True
+                self.keys[slot] = cp
+                self.glyphs[slot] = table[cp]
+
+        return True
+
+    def get_report(self) -> UnicodeTableReport:
+        """
+            Returns the layout cost
+        """
+
+        return UnicodeTableReport(
+            UnicodeLayout.HASH,
+            self.entries,
+            # keys are aligned on 4 bytes after the displacements
+            8 + -(-len(self.disp) // 2) * 4 + self.entries * 6,
+            1
+        )
+
+    def get_labels(self) -> List[Label]:
+        """
+            Returns the labels to emit
+        """
+
+        return [
+            Label(self.name)
+                .set_align(4)
+                .add(TypeDouble(TypeValue(self.entries, TypeFormat.DEFAULT)))
+                .add(TypeDouble(TypeValue(len(self.disp), TypeFormat.DEFAULT))),
+            Label(self.name + "_disp")
+                .add(DataBlock(2, TypeFormat.DEFAULT, 8, self.disp)),
+            Label(self.name + "_keys")
+                .set_align(4)
+                .add(DataBlock(4, TypeFormat.HEX, 8, self.keys)),
+            Label(self.name + "_glyphs")
+                .add(DataBlock(2, TypeFormat.DEFAULT, 8, self.glyphs))
+        ]
+
+UNICODE_LAYOUTS = {
+    UnicodeLayout.RANGE: UnicodeRangeTable,
+    UnicodeLayout.HASH: UnicodePerfectHash
+}
@@ -0,0 +1,65 @@
+"""C header module"""
+
+import re
+
+from typing import Self
+from typing import Union
+
+class CHeader:
+    """
+        Generates a C header of `#define`, every name
+        is prefixed with `prefix` and guarded by `{prefix}_H`
+    """
+
+    def __init__(self, prefix: str):
+        self.prefix = prefix
+
+        self.__lines = []
+
+    def add_define(self, name: str, value: Union[int, str]) -> Self:
+        """
+            Add `#define {prefix}_{name} value`, integers are written
+            in hexadecimal and `name` is made a valid C identifier
+        """
+
+        name = re.sub(r"\W", "_", name).upper()
+
+        if isinstance(value, int):
+            value = hex(value)
+
+        self.__lines.append(f"#define {self.prefix}_{name} {value}")
+
+        return self
+
+    def add_macro(self, name: str, args: str, body: str) -> Self:
+        """
+            Add `#define {prefix}_{name}(args) (body)`
+        """
+
+        self.__lines.append(f"#define {self.prefix}_{name}({args}) ({body})")
+
+        return self
+
+    def add_blank(self) -> Self:
+        """
+            Add an empty line
+        """
+
+        self.__lines.append("")
+
+        return self
+
+    def __str__(self) -> str:
+        guard = f"{self.prefix}_H"
+        ret = [
+            f"#ifndef {guard}",
+            f"#define {guard}",
+            "",
+            *self.__lines,
+            "",
+            f"#endif /* {guard} */",
+            ""
+        ]
+
+        return "\n".join(ret)
+
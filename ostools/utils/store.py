@@ -1,5 +1,7 @@
 """store lines module"""
 
+import copy
+
 from typing import Any
 from typing import Self
 from typing import List
@@ -28,6 +30,36 @@ class BaseStore:
         
         self.__store.clear()
     
+    def copy(self, store: List[Any]) -> Self:
+        """
+            Returns a shallow copy of the object holding `store`
+        """
+        
+        ret = copy.copy(self)
+        ret.__store = list(store)
+        
+        return ret
+    
+    def get_size(self) -> int:
+        """
+            Returns the amount of bytes emitted by the stored objs
+        """
+        
+        return sum(
+            obj.get_size() for obj in self.__store
+            if hasattr(obj, "get_size")
+        )
+    
+    def to_bytes(self) -> bytes:
+        """
+            Returns the binary form of the stored objs
+        """
+        
+        return b"".join(
+            obj.to_bytes() for obj in self.__store
+            if hasattr(obj, "to_bytes")
+        )
+    
     def add(self, obj: Any) -> Self:
         """
             Add an element to `self.__store`
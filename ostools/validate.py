@@ -0,0 +1,266 @@
+"""descriptor tables validation module"""
+
+from enum import Enum
+from typing import Dict
+from typing import List
+from typing import Union
+from dataclasses import dataclass
+
+from .gdt import Gdt
+from .gdt import GDT_START
+from .dump import GdtRow
+from .dump import IdtRow
+from .dump import decode_gdt
+from .dump import decode_idt
+from .dump import DESCRIPTOR_SIZE
+
+# Access byte bits
+ACCESS_P = 0x80
+ACCESS_S = 0x10
+ACCESS_E = 0x08
+
+# Flags byte bits (see `GdtFlags`)
+FLAGS_G = 0x80
+FLAGS_DB = 0x40
+FLAGS_L = 0x20
+
+# System descriptor types allowed in a 32 bits GDT
+GDT_SYSTEM_TYPES = {
+    0x1: "16-bit TSS (available)",
+    0x2: "LDT",
+    0x3: "16-bit TSS (busy)",
+    0x4: "16-bit call gate",
+    0x5: "task gate",
+    0x9: "32-bit TSS (available)",
+    0xb: "32-bit TSS (busy)",
+    0xc: "32-bit call gate"
+}
+
+# Gate types allowed in a 32 bits IDT
+IDT_GATE_TYPES = {
+    0x5: "task gate",
+    0x6: "16-bit interrupt gate",
+    0x7: "16-bit trap gate",
+    0xe: "32-bit interrupt gate",
+    0xf: "32-bit trap gate"
+}
+
+class Severity(Enum):
+    """
+        Available issue severities
+    """
+
+    WARNING = 0
+    ERROR = 1
+
+@dataclass
+class ValidationIssue:
+    """
+        Representing a problem found in a descriptor table
+    """
+
+    severity: Severity
+    # descriptor index, selector = index * 8
+    index: int
+    message: str
+
+def get_segment_end(row: GdtRow) -> int:
+    """
+        Returns the last byte addressed by the segment,
+        the limit scaled by the granularity
+    """
+
+    limit = row.limit
+
+    if row.flags & FLAGS_G:
+        limit = (limit << 12) | 0xfff
+
+    return row.base + limit
+
+def _get_gdt_rows(table: Union[Gdt, bytes, List[GdtRow]]) -> List[GdtRow]:
+    """
+        Returns the rows of `table`
+    """
+
+    if isinstance(table, Gdt):
+        return decode_gdt(table.to_bytes())
+
+    if isinstance(table, (bytes, bytearray, memoryview)):
+        return decode_gdt(table)
+
+    return table
+
+def _get_gdt_names(gdt: Gdt) -> Dict[int, List[str]]:
+    """
+        Returns the label names of every descriptor index
+    """
+
+    ret = {}
+    start = None
+
+    for symbol in gdt.get_symbols():
+        if symbol.name == GDT_START:
+            start = symbol.offset
+
+        if start == None or symbol.size != DESCRIPTOR_SIZE:
+            continue
+
+        index = (symbol.offset - start) // DESCRIPTOR_SIZE
+        ret.setdefault(index, []).append(symbol.name)
+
+    return ret
+
+def _check_entry(row: GdtRow, ret: List[ValidationIssue]):
+    """
+        Checks a single non null descriptor
+    """
+
+    error = lambda m: ret.append(ValidationIssue(Severity.ERROR, row.index, m))
+    warning = lambda m: ret.append(
+        ValidationIssue(Severity.WARNING, row.index, m)
+    )
+
+    if not row.access & ACCESS_P:
+        warning("Segment not present")
+
+    dpl = (row.access >> 5) & 3
+    code = row.access & ACCESS_S and row.access & ACCESS_E
+
+    if row.flags & FLAGS_L and row.flags & FLAGS_DB:
+        error("L and DB flags are both set")
+
+    if row.flags & FLAGS_L and not code:
+        error("L flag set on a non code segment")
+
+    if not row.access & ACCESS_S:
+        _type = row.access & 0xf
+
+        if not _type in GDT_SYSTEM_TYPES:
+            error(f"Invalid system descriptor type {hex(_type)}")
+        elif _type in (0x1, 0x2, 0x3, 0x9, 0xb) and dpl != 0:
+            warning(f"{GDT_SYSTEM_TYPES[_type]} with DPL {dpl}")
+
+        return
+
+    if not row.flags & FLAGS_L and get_segment_end(row) > 0xffffffff:
+        error("Segment exceeds 4 GiB")
+
+def validate_gdt(table: Union[Gdt, bytes, List[GdtRow]]) -> List[ValidationIssue]:
+    """
+        Checks every descriptor of `table` in a single sweep,
+        O(n log n) for the overlaps
+    """
+
+    ret = []
+    rows = _get_gdt_rows(table)
+
+    if not rows or any((
+        rows[0].base,
+        rows[0].limit,
+        rows[0].access,
+        rows[0].flags
+    )):
+        ret.append(ValidationIssue(Severity.ERROR, 0, "Missing null entry"))
+
+    if isinstance(table, Gdt):
+        seen = {}
+
+        for index, names in sorted(_get_gdt_names(table).items()):
+            for name in names:
+                if name in seen and seen[name] != index:
+                    ret.append(
+                        ValidationIssue(
+                            Severity.ERROR,
+                            index,
+                            f"Duplicate selector {name} (see {seen[name]})"
+                        )
+                    )
+
+                seen.setdefault(name, index)
+
+    segments = []
+
+    for row in rows[1:]:
+        _check_entry(row, ret)
+
+        if row.access & ACCESS_P and row.access & ACCESS_S \
+            and not row.flags & FLAGS_L:
+            segments.append(row)
+
+    # Overlapping segments of the same kind and privilege level
+    kind = lambda row: (bool(row.access & ACCESS_E), (row.access >> 5) & 3)
+
+    segments.sort(key=lambda row: (kind(row), row.base))
+
+    last = None
+
+    for row in segments:
+        if last and kind(last) == kind(row) \
+            and row.base <= get_segment_end(last):
+            if row.base == last.base \
+                and get_segment_end(row) == get_segment_end(last):
+                message = f"Segment aliases {last.index}"
+            else:
+                message = f"Segment overlaps {last.index}"
+
+            ret.append(ValidationIssue(Severity.WARNING, row.index, message))
+
+        if not last or kind(last) != kind(row) \
+            or get_segment_end(row) > get_segment_end(last):
+            last = row
+
+    return sorted(ret, key=lambda issue: issue.index)
+
+def validate_idt(
+    table: Union[bytes, List[IdtRow]],
+    gdt: Union[Gdt, bytes, List[GdtRow], None] = None
+) -> List[ValidationIssue]:
+    """
+        Checks every gate of `table`, selectors are resolved
+        against `gdt` when it is given
+    """
+
+    ret = []
+    rows = table
+
+    if isinstance(table, (bytes, bytearray, memoryview)):
+        rows = decode_idt(table)
+
+    segments = None if gdt == None else _get_gdt_rows(gdt)
+
+    for row in rows:
+        if not row.is_present():
+            continue
+
+        error = lambda m: ret.append(
+            ValidationIssue(Severity.ERROR, row.index, m)
+        )
+
+        if not row.get_type() in IDT_GATE_TYPES:
+            error(f"Invalid gate type {hex(row.get_type())}")
+
+            continue
+
+        # Task gates only hold a TSS selector
+        if row.get_type() == 0x5:
+            continue
+
+        index = row.selector // DESCRIPTOR_SIZE
+
+        if index == 0:
+            error("Null code selector")
+        elif segments != None:
+            if index >= len(segments):
+                error(f"Selector {hex(row.selector)} out of the GDT")
+            elif not (
+                segments[index].access & ACCESS_S
+                and segments[index].access & ACCESS_E
+            ):
+                error(f"Selector {hex(row.selector)} isnt a code segment")
+
+        if row.offset == 0:
+            ret.append(
+                ValidationIssue(Severity.WARNING, row.index, "Null handler")
+            )
+
+    return ret